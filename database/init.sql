@@ -102,6 +102,11 @@ COMMENT ON TABLE room_equipment IS 'Many-to-many relationship between rooms and
 -- ============================================
 -- BOOKINGS TABLE (Team Member 1: Dana)
 -- ============================================
+-- Native enums: 4 bytes per row/index entry instead of up to 20 chars of
+-- text, so the status-bearing composite indexes pack more entries per page
+CREATE TYPE booking_status AS ENUM ('pending', 'confirmed', 'cancelled', 'completed');
+CREATE TYPE booking_action AS ENUM ('created', 'updated', 'cancelled', 'completed');
+
 CREATE TABLE bookings (
     booking_id SERIAL PRIMARY KEY,
     user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
@@ -109,8 +114,7 @@ CREATE TABLE bookings (
     booking_date DATE NOT NULL,
     start_time TIME NOT NULL,
     end_time TIME NOT NULL,
-    status VARCHAR(20) DEFAULT 'confirmed'
-        CHECK (status IN ('pending', 'confirmed', 'cancelled', 'completed')),
+    status booking_status DEFAULT 'confirmed',
     purpose TEXT,
     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
@@ -139,12 +143,44 @@ ADD CONSTRAINT no_overlapping_bookings
 EXCLUDE USING gist (
     room_id WITH =,           -- Same room
     booking_range WITH &&     -- Overlapping time ranges
-);
+) WHERE (status IN ('confirmed', 'pending'));
+-- The WHERE clause exempts cancelled/completed rows: a cancelled slot can
+-- be re-booked, and the partial GiST index stays small as soft-deleted
+-- rows accumulate.
 
 CREATE INDEX idx_bookings_user ON bookings(user_id);
-CREATE INDEX idx_bookings_room ON bookings(room_id);
-CREATE INDEX idx_bookings_date ON bookings(booking_date);
-CREATE INDEX idx_bookings_status ON bookings(status);
+
+-- Conflict detection filters on room + date + status together; composite
+-- indexes match the predicate instead of bitmap-ANDing single columns.
+-- The partial index keeps soft-deleted (cancelled) rows out of the
+-- availability scan.
+CREATE INDEX ix_bookings_room_date_status ON bookings(room_id, booking_date, status);
+CREATE INDEX ix_bookings_user_status ON bookings(user_id, status);
+-- Matches the (booking_date, booking_id) keyset pagination order of the
+-- per-user list endpoints
+CREATE INDEX ix_bookings_user_keyset ON bookings(user_id, booking_date, booking_id);
+-- Wide enough that the time-overlap predicate is evaluated inside the
+-- index scan (index-only for conflict checks and availability probes)
+CREATE INDEX ix_bookings_active ON bookings(room_id, booking_date, start_time, end_time)
+    WHERE status IN ('confirmed', 'pending');
+
+-- Covering / expression indexes for the analytics endpoints.
+-- They match the per-user filter plus the column each aggregate groups
+-- or filters on, so summary/trends/peak-hours/day-of-week run as
+-- index(-only) scans instead of sequential scans.
+-- (Use CREATE INDEX CONCURRENTLY when adding these to a live database.)
+CREATE INDEX idx_bookings_user_created ON bookings(user_id, created_at)
+    INCLUDE (status, booking_id);
+CREATE INDEX idx_bookings_user_starthour ON bookings(user_id, (EXTRACT(hour FROM start_time)));
+CREATE INDEX idx_bookings_user_dow ON bookings(user_id, (EXTRACT(dow FROM booking_date)));
+CREATE INDEX idx_bookings_status_user ON bookings(status, user_id);
+
+-- Range filters on start_time scoped per user (upcoming-bookings views,
+-- schedule lookups) want the newest slots first.
+CREATE INDEX idx_bookings_user_start ON bookings(user_id, start_time DESC);
+-- booking_date correlates almost perfectly with insertion order, so a
+-- BRIN index covers date-range scans at a fraction of a btree's size.
+CREATE INDEX idx_bookings_date_brin ON bookings USING brin (booking_date);
 
 COMMENT ON TABLE bookings IS 'Room reservations with automatic double-booking prevention';
 COMMENT ON COLUMN bookings.booking_range IS 'Generated tsrange used by exclusion constraint for conflict detection';
@@ -158,8 +194,7 @@ CREATE TABLE booking_history (
     booking_id INTEGER NOT NULL REFERENCES bookings(booking_id) ON DELETE CASCADE,
     user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
     room_id INTEGER NOT NULL REFERENCES rooms(room_id) ON DELETE CASCADE,
-    action VARCHAR(20) NOT NULL
-        CHECK (action IN ('created', 'updated', 'cancelled', 'completed')),
+    action booking_action NOT NULL,
     previous_start_time TIME,
     previous_end_time TIME,
     new_start_time TIME,
@@ -172,10 +207,24 @@ CREATE TABLE booking_history (
         FOREIGN KEY (changed_by) REFERENCES users(user_id) ON DELETE SET NULL
 );
 
-CREATE INDEX idx_booking_history_booking ON booking_history(booking_id);
-CREATE INDEX idx_booking_history_timestamp ON booking_history(timestamp);
+-- Matches the per-booking history query (WHERE booking_id ORDER BY
+-- timestamp DESC) so the scan is already in output order; also covers
+-- every lookup a plain booking_id index would serve
+CREATE INDEX ix_hist_booking_ts ON booking_history(booking_id, timestamp);
 CREATE INDEX idx_booking_history_action ON booking_history(action);
 
+-- BRIN instead of B-tree for the timestamp: history is append-only, so
+-- rows are physically ordered by insertion time and a block-range index
+-- (a few KB vs. a B-tree that grows with the table) answers time-range
+-- audit scans just as well while staying resident in cache
+CREATE INDEX ix_booking_history_ts_brin ON booking_history
+    USING BRIN (timestamp) WITH (pages_per_range = 32);
+
+-- Partial index: the cancellation-rate trend only ever scans
+-- action = 'cancelled' rows by timestamp
+CREATE INDEX idx_booking_history_cancelled_ts ON booking_history(timestamp)
+    WHERE action = 'cancelled';
+
 COMMENT ON TABLE booking_history IS 'Complete immutable audit trail of all booking modifications';
 COMMENT ON COLUMN booking_history.changed_by IS 'User who performed the action (NULL if user deleted)';
 
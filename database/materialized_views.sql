@@ -0,0 +1,82 @@
+-- ============================================
+-- Smart Meeting Room Management System
+-- Analytics Materialized Views (PostgreSQL 17)
+-- Author: Dana Kossaybati
+-- ============================================
+-- Precomputes the unbounded aggregate scans behind the analytics
+-- endpoints (peak hours, day-of-week, monthly cancellations) so they
+-- read a few pre-aggregated rows instead of scanning bookings /
+-- booking_history on every call.
+--
+-- Apply after init.sql. Each view keeps user_id in the grouping so the
+-- per-user (non-admin) scope can still be answered from the view by
+-- summing the caller's rows.
+--
+-- Refresh every 5-15 minutes, e.g. with pg_cron:
+--   SELECT cron.schedule('refresh-analytics-views', '*/10 * * * *', $$
+--     REFRESH MATERIALIZED VIEW CONCURRENTLY mv_peak_hours;
+--     REFRESH MATERIALIZED VIEW CONCURRENTLY mv_dow;
+--     REFRESH MATERIALIZED VIEW CONCURRENTLY mv_monthly_cancellations;
+--   $$);
+-- The unique indexes below are required for CONCURRENTLY.
+
+DROP MATERIALIZED VIEW IF EXISTS mv_peak_hours;
+DROP MATERIALIZED VIEW IF EXISTS mv_dow;
+DROP MATERIALIZED VIEW IF EXISTS mv_monthly_cancellations;
+DROP MATERIALIZED VIEW IF EXISTS mv_room_schedule;
+
+-- Hourly booking distribution (backs /analytics/bookings/peak-hours)
+CREATE MATERIALIZED VIEW mv_peak_hours AS
+SELECT user_id,
+       EXTRACT(hour FROM start_time)::int AS hour,
+       COUNT(*) AS cnt
+FROM bookings
+GROUP BY user_id, EXTRACT(hour FROM start_time)::int;
+
+CREATE UNIQUE INDEX ux_mv_peak_hours ON mv_peak_hours(user_id, hour);
+
+-- Day-of-week distribution (backs /analytics/bookings/day-of-week)
+CREATE MATERIALIZED VIEW mv_dow AS
+SELECT user_id,
+       EXTRACT(dow FROM booking_date)::int AS day_of_week,
+       COUNT(*) AS cnt
+FROM bookings
+GROUP BY user_id, EXTRACT(dow FROM booking_date)::int;
+
+CREATE UNIQUE INDEX ux_mv_dow ON mv_dow(user_id, day_of_week);
+
+-- Monthly cancellation counts, last 6 months
+-- (backs the trend section of /analytics/bookings/cancellation-rate)
+CREATE MATERIALIZED VIEW mv_monthly_cancellations AS
+SELECT user_id,
+       date_trunc('month', timestamp) AS month,
+       COUNT(*) AS cnt
+FROM booking_history
+WHERE action = 'cancelled'
+  AND timestamp >= CURRENT_TIMESTAMP - INTERVAL '6 months'
+GROUP BY user_id, date_trunc('month', timestamp);
+
+CREATE UNIQUE INDEX ux_mv_monthly_cancellations
+    ON mv_monthly_cancellations(user_id, month);
+
+-- Active bookings for today plus the next 7 days
+-- (backs /api/bookings/room/{room_id}/schedule, which is hit on every
+-- room tile render). Refresh this one more aggressively than the
+-- analytics views - every minute keeps schedule staleness acceptable:
+--   SELECT cron.schedule('refresh-room-schedule', '* * * * *',
+--     'REFRESH MATERIALIZED VIEW CONCURRENTLY mv_room_schedule');
+CREATE MATERIALIZED VIEW mv_room_schedule AS
+SELECT booking_id, room_id, booking_date, start_time, end_time,
+       user_id, status, purpose
+FROM bookings
+WHERE status IN ('confirmed', 'pending')
+  AND booking_date BETWEEN CURRENT_DATE AND CURRENT_DATE + 7;
+
+CREATE UNIQUE INDEX ux_mv_room_schedule ON mv_room_schedule(booking_id);
+CREATE INDEX ix_mv_room_schedule_room
+    ON mv_room_schedule(room_id, booking_date, start_time);
+
+COMMENT ON MATERIALIZED VIEW mv_peak_hours IS 'Pre-aggregated hourly booking counts per user for analytics';
+COMMENT ON MATERIALIZED VIEW mv_dow IS 'Pre-aggregated day-of-week booking counts per user for analytics';
+COMMENT ON MATERIALIZED VIEW mv_monthly_cancellations IS 'Pre-aggregated monthly cancellation counts per user for analytics';
+COMMENT ON MATERIALIZED VIEW mv_room_schedule IS 'Active bookings for the next 7 days, denormalized for room schedule lookups';
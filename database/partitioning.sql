@@ -0,0 +1,128 @@
+-- ============================================
+-- Smart Meeting Room Management System
+-- Monthly range partitioning for bookings (PostgreSQL 17)
+-- Author: Dana Kossaybati
+-- ============================================
+-- Every hot query on bookings filters by booking_date (conflict checks,
+-- room schedules, keyset pagination), so range-partitioning by month
+-- lets the planner prune all but the relevant partition: the working
+-- set per query shrinks to one month of rows, per-partition indexes
+-- stay small, and old months can be detached and archived without
+-- bloating the live table.
+--
+-- Apply after init.sql, ideally during a maintenance window: the swap
+-- below takes an ACCESS EXCLUSIVE lock on bookings while it copies
+-- rows. SERIAL sequence, indexes, and constraints carry over to the
+-- new table; partitioned indexes cascade to every partition
+-- automatically.
+--
+-- Ongoing partition creation is handled by pg_partman (one partition
+-- per month, three created ahead):
+--   CREATE EXTENSION pg_partman;
+--   SELECT partman.create_parent(
+--       p_parent_table => 'public.bookings',
+--       p_control      => 'booking_date',
+--       p_interval     => '1 month',
+--       p_premake      => 3
+--   );
+--   SELECT cron.schedule('partman-maintenance', '@daily',
+--                        $$SELECT partman.run_maintenance()$$);
+
+BEGIN;
+
+ALTER TABLE bookings RENAME TO bookings_unpartitioned;
+
+-- Same shape as init.sql, plus PARTITION BY. PostgreSQL requires the
+-- partition key in the primary key and in any exclusion constraint, so
+-- the PK widens to (booking_id, booking_date) and the EXCLUDE gains
+-- booking_date WITH = (a no-op semantically: booking_range already
+-- embeds the date, so rows on different dates never overlap anyway).
+CREATE TABLE bookings (
+    booking_id INTEGER NOT NULL DEFAULT nextval('bookings_unpartitioned_booking_id_seq'),
+    user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    room_id INTEGER NOT NULL REFERENCES rooms(room_id) ON DELETE CASCADE,
+    booking_date DATE NOT NULL,
+    start_time TIME NOT NULL,
+    end_time TIME NOT NULL,
+    status booking_status DEFAULT 'confirmed',
+    purpose TEXT,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    cancelled_at TIMESTAMPTZ,
+    cancelled_by INTEGER REFERENCES users(user_id) ON DELETE SET NULL,
+
+    CONSTRAINT chk_time_order CHECK (end_time > start_time),
+
+    booking_range tsrange GENERATED ALWAYS AS (
+        tsrange(
+            (booking_date::timestamp + start_time),
+            (booking_date::timestamp + end_time),
+            '[)'
+        )
+    ) STORED,
+
+    PRIMARY KEY (booking_id, booking_date),
+
+    CONSTRAINT no_overlapping_bookings
+    EXCLUDE USING gist (
+        room_id WITH =,
+        booking_date WITH =,
+        booking_range WITH &&
+    ) WHERE (status IN ('confirmed', 'pending'))
+) PARTITION BY RANGE (booking_date);
+
+-- Partitioned indexes: defined once on the parent, created on every
+-- current and future partition. Same set as init.sql.
+CREATE INDEX idx_bookings_user ON bookings(user_id);
+CREATE INDEX ix_bookings_room_date_status ON bookings(room_id, booking_date, status);
+CREATE INDEX ix_bookings_user_status ON bookings(user_id, status);
+CREATE INDEX ix_bookings_user_keyset ON bookings(user_id, booking_date, booking_id);
+CREATE INDEX ix_bookings_active ON bookings(room_id, booking_date, start_time, end_time)
+    WHERE status IN ('confirmed', 'pending');
+CREATE INDEX idx_bookings_user_created ON bookings(user_id, created_at)
+    INCLUDE (status, booking_id);
+CREATE INDEX idx_bookings_user_starthour ON bookings(user_id, (EXTRACT(hour FROM start_time)));
+CREATE INDEX idx_bookings_user_dow ON bookings(user_id, (EXTRACT(dow FROM booking_date)));
+CREATE INDEX idx_bookings_status_user ON bookings(status, user_id);
+CREATE INDEX idx_bookings_user_start ON bookings(user_id, start_time DESC);
+CREATE INDEX idx_bookings_date_brin ON bookings USING brin (booking_date);
+
+-- One partition per month, a year back and a quarter ahead; pg_partman
+-- takes over creation from here. The DEFAULT partition catches strays
+-- (far-future bookings) rather than erroring.
+DO $$
+DECLARE
+    month_start date := date_trunc('month', CURRENT_DATE) - interval '12 months';
+    month_end   date;
+BEGIN
+    WHILE month_start < date_trunc('month', CURRENT_DATE) + interval '4 months' LOOP
+        month_end := month_start + interval '1 month';
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF bookings FOR VALUES FROM (%L) TO (%L)',
+            'bookings_' || to_char(month_start, 'YYYY_MM'),
+            month_start,
+            month_end
+        );
+        month_start := month_end;
+    END LOOP;
+END $$;
+
+CREATE TABLE bookings_default PARTITION OF bookings DEFAULT;
+
+-- Move existing rows into the partitioned table (booking_range is
+-- generated, so it is excluded from the column list)
+INSERT INTO bookings (booking_id, user_id, room_id, booking_date,
+                      start_time, end_time, status, purpose,
+                      created_at, updated_at, cancelled_at, cancelled_by)
+SELECT booking_id, user_id, room_id, booking_date,
+       start_time, end_time, status, purpose,
+       created_at, updated_at, cancelled_at, cancelled_by
+FROM bookings_unpartitioned;
+
+ALTER SEQUENCE bookings_unpartitioned_booking_id_seq RENAME TO bookings_booking_id_seq;
+
+DROP TABLE bookings_unpartitioned;
+
+COMMENT ON TABLE bookings IS 'Room reservations, range-partitioned by month on booking_date';
+
+COMMIT;
@@ -1,5 +1,6 @@
 # Configuration file for Sphinx documentation builder
 
+import gc
 import os
 import sys
 
@@ -7,6 +8,13 @@ import sys
 sys_path = os.path.abspath('../../services')
 sys.path.insert(0, sys_path)
 
+# Freeze everything imported so far out of the cyclic garbage collector.
+# Sphinx with -j auto forks worker processes; moving the long-lived config
+# and extension objects to the permanent generation keeps copy-on-write
+# pages shared between workers and stops full collections from rescanning
+# them (on CPython 3.13+ the incremental collector also skips them).
+gc.freeze()
+
 # Project information
 project = 'Smart Meeting Room - Services API'
 copyright = '2025, Dana Kossaybati & Reem Hamdar'
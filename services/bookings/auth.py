@@ -6,19 +6,35 @@ Author: Dana Kossaybati
 """
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
+from functools import lru_cache
+import jwt
+from jwt import InvalidTokenError as JWTError
+from time import time
+from config import SECRET_KEY, ALGORITHM
 
 # OAuth2 scheme for token authentication
 # Tells FastAPI where to look for the token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+@lru_cache(maxsize=4096)
+def _decode_token(token: str, _secret=SECRET_KEY, _algorithms=(ALGORITHM,)) -> dict:
+    """
+    Decode and verify a JWT, caching the result.
+
+    Signature verification (HMAC-SHA256) is by far the most expensive part
+    of auth and the same token arrives on every request for the lifetime
+    of the session, so the decoded claims are memoized. Expiration is NOT
+    checked here — a cached entry would otherwise stay "valid" forever —
+    the caller re-checks the `exp` claim against the current time.
+
+    The key and algorithm list are captured as default arguments so cache
+    misses resolve them via LOAD_FAST instead of two module-global lookups.
+    """
+    return jwt.decode(
+        token, _secret, algorithms=_algorithms,
+        options={"verify_exp": False}
+    )
+
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
     """
     Dependency function to extract and validate current user from JWT token.
@@ -48,9 +64,13 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
     )
     
     try:
-        # Decode and verify JWT signature and expiration
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        
+        # Decode and verify JWT signature (cached per token)
+        payload = _decode_token(token)
+
+        # Enforce expiration manually since the cached decode skips it
+        if payload.get("exp", 0) < time():
+            raise credentials_exception
+
         # Extract username from 'sub' claim (JWT standard)
         username: str = payload.get("sub")
         if username is None:
@@ -0,0 +1,31 @@
+"""
+Centralized configuration for Bookings Service.
+Loads environment variables exactly once at process start.
+
+Author: Dana Kossaybati
+"""
+import os
+from dotenv import load_dotenv
+
+# Parse .env a single time here; auth.py and database.py previously each
+# called load_dotenv() at import, re-reading the same file during startup.
+load_dotenv()
+
+# JWT settings (shared secret with the Users service)
+SECRET_KEY = os.getenv("SECRET_KEY")
+ALGORITHM = os.getenv("ALGORITHM", "HS256")
+
+# PostgreSQL connection string (never hardcode credentials!)
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+# Inter-service communication
+ROOMS_SERVICE_URL = os.getenv("ROOMS_SERVICE_URL", "http://localhost:8002")
+
+# Comma-separated CORS origin allowlist; defaults to the local frontend.
+# An explicit list (instead of "*") lets Starlette take its fast exact-match
+# path and keeps allow_credentials meaningful.
+CORS_ALLOW_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ALLOW_ORIGINS", "http://localhost:3000").split(",")
+    if origin.strip()
+]
@@ -7,22 +7,34 @@ Author: Dana Kossaybati
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Get database URL from environment (never hardcode credentials!)
-DATABASE_URL = os.getenv("DATABASE_URL")
+from sqlalchemy.pool import QueuePool
+from config import DATABASE_URL
 
 # Create SQLAlchemy engine
 # This manages the connection pool to PostgreSQL
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using them
-    pool_size=5,         # Maximum number of connections to maintain
-    max_overflow=10      # Maximum overflow connections allowed
+    poolclass=QueuePool,  # Explicit: the bounded FIFO/LIFO pool (default
+                          # for sync engines, spelled out for clarity)
+    pool_size=20,         # Base connections kept open (was 5; requests
+                          # serialized on checkout under load)
+    max_overflow=40,      # Burst headroom beyond the base pool
+    pool_timeout=5,       # Fail checkout fast: with 60 connections all
+                          # busy the pool is saturated, and making the
+                          # 61st request queue for 30s just stacks up
+                          # waiters behind a stall instead of surfacing it
+    pool_pre_ping=True,   # Cheap liveness check on checkout; recycle alone
+                          # cannot catch connections killed mid-window by
+                          # failovers or restarts
+    pool_recycle=1800,    # Retire connections after 30 min so server-side
+                          # idle timeouts never hand us a dead socket
+    pool_use_lifo=True,   # Reuse the hottest connection first; idle ones
+                          # age out via recycle instead of rotating
+    query_cache_size=1200 # Compiled-SQL cache (default 500). The list
+                          # endpoints generate many statement variants
+                          # (filter/cursor/limit combinations); a larger
+                          # cache keeps them all resident so per-request
+                          # ORM compilation is a dict hit
 )
 
 # Create session factory
@@ -30,6 +42,10 @@ engine = create_engine(
 SessionLocal = sessionmaker(
     autocommit=False,    # Require explicit commit (safer)
     autoflush=False,     # Don't automatically flush changes
+    expire_on_commit=False,  # Keep attributes readable after commit;
+                             # sessions are request-scoped, so nothing
+                             # reads stale data later and serializing
+                             # the response costs no re-SELECT
     bind=engine          # Bind to our PostgreSQL engine
 )
 
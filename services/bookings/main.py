@@ -4,30 +4,96 @@ Configures the app, middleware, and registers routes.
 
 Author: Dana Kosssaybati
 """
-from fastapi import FastAPI
+import logging
+import logging.handlers
+import queue
+
+import anyio.to_thread
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from config import CORS_ALLOW_ORIGINS
 from routes import router as bookings_router
 import analytics
 
+# Non-blocking logging: handlers only enqueue records; a background
+# QueueListener thread does the actual stream writes. Request threads
+# (and the event loop) never block on stdio, and traceback formatting
+# is deferred to the listener.
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, logging.StreamHandler(), respect_handler_level=True
+)
+_log_listener.start()
+logging.basicConfig(
+    level=logging.INFO,
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
+)
+
+logger = logging.getLogger(__name__)
+
 # Create FastAPI application instance
 app = FastAPI(
     title="Bookings Service",
     description="Room reservation and availability management microservice for Smart Meeting Room System",
     version="1.0.0",
     docs_url="/docs",      # Swagger UI at /docs
-    redoc_url="/redoc"     # ReDoc at /redoc
+    redoc_url="/redoc",    # ReDoc at /redoc
+    # orjson serializes the large analytics payloads (365-day trends,
+    # hourly distributions) several times faster than stdlib json
+    default_response_class=ORJSONResponse
 )
     
 # Configure CORS (Cross-Origin Resource Sharing)
 # Allows frontend applications to call this API
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],          # In production, specify exact origins
+    allow_origins=CORS_ALLOW_ORIGINS,  # Explicit allowlist (wildcard also
+                                       # silently disables credentials)
     allow_credentials=True,        # Allow cookies/authorization headers
     allow_methods=["*"],           # Allow all HTTP methods
     allow_headers=["*"],           # Allow all headers
 )
 
+@app.on_event("startup")
+async def raise_threadpool_limit():
+    """
+    Widen the anyio threadpool that runs the plain-def handlers.
+
+    The DB-touching endpoints are deliberately sync so FastAPI dispatches
+    them off the event loop, but anyio's default limiter allows only 40
+    worker threads - a hard concurrency ceiling well below what the
+    connection pool (20 + 40 overflow) can serve. 100 tokens lets the
+    threadpool saturate the pool before requests start queueing.
+    """
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 100
+
+# App-level exception handlers replace the per-route try/except blocks.
+# The custom exceptions in errors.py subclass HTTPException, so FastAPI
+# already renders them; only ValueError (service-layer validation) and
+# truly unexpected errors need translating here. Handling them once
+# keeps every handler body a straight call into the service layer with
+# no SETUP_FINALLY frame overhead per request.
+@app.exception_handler(ValueError)
+async def value_error_handler(request: Request, exc: ValueError):
+    """Translate service-layer validation errors to 400 responses."""
+    return ORJSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": str(exc)}
+    )
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """Log unexpected errors and return a generic 500 response."""
+    logger.exception(
+        "Unhandled error on %s %s", request.method, request.url.path,
+        exc_info=exc
+    )
+    return ORJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": "An internal error occurred"}
+    )
+
 # Include API routes
 app.include_router(bookings_router)
 
@@ -66,13 +132,20 @@ async def health_check():
 
 # Run the application
 if __name__ == "__main__":
+    import os
     import uvicorn
-    
+
     # Start Uvicorn server
+    # uvloop (libuv) and httptools replace the default asyncio loop and
+    # h11 parser; multiple workers spread async I/O across cores. The app
+    # is passed as an import string because worker processes re-import it.
     uvicorn.run(
-        app,
-        host="0.0.0.0",    # Listen on all network interfaces
-        port=8003,          # Bookings service port
+        "main:app",
+        host="0.0.0.0",           # Listen on all network interfaces
+        port=8003,                 # Bookings service port
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count(),
         reload=False,
         log_level="info"
     )
@@ -4,7 +4,7 @@ Defines Booking and BookingHistory table structures.
 
 Author: Dana Kossaybati
 """
-from sqlalchemy import Column, Integer, String, Date, Time, DateTime, Text
+from sqlalchemy import Column, Integer, String, Date, Time, DateTime, Text, Boolean, Enum, Index, text
 from sqlalchemy.sql import func
 from database import Base
 
@@ -30,7 +30,35 @@ class Booking(Base):
         cancelled_by: User ID who cancelled (for audit trail)
     """
     __tablename__ = "bookings"
-    
+
+    # Fetch server-generated defaults (created_at) with RETURNING on the
+    # INSERT itself instead of a post-commit SELECT per write
+    __mapper_args__ = {"eager_defaults": True}
+
+    # Composite indexes shaped after the hot predicates. Conflict
+    # detection filters on room + date + status together, so one range
+    # scan replaces bitmap-ANDing three single-column indexes; the
+    # partial index keeps ever-growing cancelled rows (soft-delete) out
+    # of the availability scan entirely.
+    __table_args__ = (
+        Index("ix_bookings_room_date_status", "room_id", "booking_date", "status"),
+        Index("ix_bookings_user_status", "user_id", "status"),
+        # Matches the (booking_date, booking_id) keyset pagination order
+        # of the per-user list endpoints
+        Index("ix_bookings_user_keyset", "user_id", "booking_date", "booking_id"),
+        # Wide enough that the overlap predicate (start < :end AND
+        # end > :start) is evaluated inside the index scan - conflict
+        # checks and availability probes never touch the heap
+        Index(
+            "ix_bookings_active",
+            "room_id",
+            "booking_date",
+            "start_time",
+            "end_time",
+            postgresql_where=text("status IN ('confirmed', 'pending')")
+        ),
+    )
+
     # Primary key - auto-incremented integer
     booking_id = Column(Integer, primary_key=True, index=True)
     
@@ -43,15 +71,13 @@ class Booking(Base):
     )
     room_id = Column(
         Integer,
-        nullable=False,
-        index=True  # Indexed for fast "room schedule" queries
+        nullable=False  # Covered by the composite indexes above
     )
-    
+
     # Booking time information
     booking_date = Column(
         Date,
-        nullable=False,
-        index=True  # Indexed for date-based queries and conflict detection
+        nullable=False  # Covered by ix_bookings_room_date_status / ix_bookings_active
     )
     start_time = Column(
         Time,
@@ -65,11 +91,17 @@ class Booking(Base):
     
     # Booking metadata
     status = Column(
-        String(20),
+        # Native 4-byte enum on PostgreSQL (vs up to 20 chars of text per
+        # row and index entry); VARCHAR + CHECK on SQLite. Indexed via the
+        # composite __table_args__ indexes.
+        Enum(
+            "pending", "confirmed", "cancelled", "completed",
+            name="booking_status",
+            create_constraint=True,
+            validate_strings=True
+        ),
         nullable=False,
-        default="confirmed",
-        index=True  # Indexed for filtering by status
-        # Possible values: pending, confirmed, cancelled, completed
+        default="confirmed"
     )
     purpose = Column(
         Text,
@@ -122,25 +154,47 @@ class BookingHistory(Base):
         timestamp: When the change occurred
     """
     __tablename__ = "booking_history"
-    
+
+    # History is append-only, so timestamps correlate with physical row
+    # order: a BRIN index (block-range summaries, a few KB regardless of
+    # table size) serves time-range audit scans where a B-tree would
+    # grow without bound. Plain index on non-PostgreSQL backends.
+    __table_args__ = (
+        # Matches get_booking_history exactly (WHERE booking_id ORDER BY
+        # timestamp DESC): the scan walks one booking's entries in index
+        # order with no sort step. Supersedes the old single-column
+        # booking_id index.
+        Index("ix_hist_booking_ts", "booking_id", "timestamp"),
+        Index(
+            "ix_booking_history_ts_brin",
+            "timestamp",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32}
+        ),
+    )
+
     history_id = Column(Integer, primary_key=True, index=True)
-    
+
     # Links to the booking being tracked
     booking_id = Column(
         Integer,
-        nullable=False,
-        index=True  # Indexed for fast history lookup by booking
+        nullable=False  # Leading column of ix_hist_booking_ts above
     )
     
     # Snapshot of booking state
     user_id = Column(Integer, nullable=False)
     room_id = Column(Integer, nullable=False)
     
-    # Type of change that occurred
+    # Type of change that occurred (same tight representation as
+    # Booking.status: native enum on PostgreSQL, CHECK on SQLite)
     action = Column(
-        String(20),
+        Enum(
+            "created", "updated", "cancelled", "completed",
+            name="booking_action",
+            create_constraint=True,
+            validate_strings=True
+        ),
         nullable=False
-        # Values: 'created', 'updated', 'cancelled', 'completed'
     )
     
     # Previous state (for updates) - null for creation
@@ -158,14 +212,32 @@ class BookingHistory(Base):
     )
     timestamp = Column(
         DateTime(timezone=True),
-        server_default=func.now(),
-        index=True  # Indexed for time-based queries
+        server_default=func.now()  # Covered by the BRIN index above
     )
     
     def __repr__(self):
         """String representation for debugging."""
         return f"<BookingHistory(booking={self.booking_id}, action={self.action}, time={self.timestamp})>"
 
+class User(Base):
+    """
+    Read-only User model for analytics queries.
+    Actual CRUD operations handled by Users Service.
+    This model lets the analytics endpoints aggregate over user accounts.
+    """
+    __tablename__ = 'users'
+
+    user_id = Column(Integer, primary_key=True)
+    username = Column(String(50), nullable=False)
+    email = Column(String(100), nullable=False)
+    full_name = Column(String(100), nullable=False)
+    role = Column(String(20), nullable=False, default='regular_user')
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<User(id={self.user_id}, username={self.username}, role={self.role})>"
+
 class Room(Base):
     """
     Read-only Room model for foreign key validation.
@@ -3,26 +3,24 @@ API route handlers for Bookings Service.
 Routes are kept thin - they only handle HTTP concerns.
 All business logic is delegated to the service layer.
 
+Handlers that do blocking SQLAlchemy work are declared as plain `def`
+so FastAPI runs them on its threadpool; an `async def` handler would
+hold the event loop for the whole query and serialize all requests.
+
 Author: Dana Kossaybati
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import date as date_type
-import traceback
-from utils import cache_response
+from typing import List, Optional, Union
+from datetime import date as date_type, time as time_type
+from utils import cache_response, decode_booking_cursor, encode_booking_cursor
 
 import schemas
 import auth
 from database import get_db
 from services import BookingService
-from errors import (
-    BookingNotFoundException,
-    BookingConflictException,
-    RoomNotFoundException,
-    UnauthorizedBookingAccessException,
-    InvalidBookingStateException
-)
+from errors import UnauthorizedBookingAccessException
 
 # Create router with prefix and tags for documentation
 router = APIRouter(
@@ -31,6 +29,17 @@ router = APIRouter(
     responses={404: {"description": "Not found"}}
 )
 
+def _booking_rows_payload(rows) -> list:
+    """
+    Serialize booking Rows straight to dicts for ORJSONResponse.
+
+    The list queries select exactly the response columns, so per-field
+    pydantic validation re-proves what the database already guarantees;
+    skipping it hands orjson plain dicts whose date/time/datetime values
+    it encodes natively in C.
+    """
+    return [dict(row._mapping) for row in rows]
+
 @router.post(
     "/",
     response_model=schemas.BookingResponse,
@@ -38,7 +47,7 @@ router = APIRouter(
     summary="Create a new booking",
     description="Reserve a room for specified date and time"
 )
-async def create_booking(
+def create_booking(
     booking_data: schemas.BookingCreate,
     current_user: dict = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
@@ -98,43 +107,75 @@ async def create_booking(
             "purpose": "Team standup meeting"
         }
     """
-    try:
-        # Delegate to service layer
-        new_booking = await BookingService.create_booking(
-            db, booking_data, current_user
-        )
-        return new_booking
-    
-    except ValueError as e:
-        # Validation errors (date/time)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    
-    except (RoomNotFoundException, BookingConflictException) as e:
-        # Re-raise HTTP exceptions as-is
-        raise e
-    
-    except Exception as e:
-        # Unexpected errors
-        print(f"Error creating booking: {str(e)}")
-        traceback.print_exc()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An error occurred while creating booking"
-        )
+    # Errors surface through the app-level exception handlers in main.py:
+    # the custom exceptions are HTTPException subclasses and ValueError
+    # maps to 400 there, so no per-route try/except is needed
+    return BookingService.create_booking(db, booking_data, current_user)
+
+@router.post(
+    "/bulk",
+    response_model=List[schemas.BookingResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Create multiple bookings",
+    description="Reserve a batch of slots (e.g. a recurring meeting) in one transaction"
+)
+def create_bookings_bulk(
+    bookings_data: List[schemas.BookingCreate],
+    current_user: dict = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create a batch of bookings in a single request.
+
+    Designed for recurring meetings: the client sends every occurrence
+    at once instead of calling POST /api/bookings/ per week. The whole
+    batch is validated and conflict-checked together and written with
+    one multi-row INSERT and one commit - all-or-nothing.
+
+    Args:
+        bookings_data (list[schemas.BookingCreate]): Up to 100 bookings,
+            each with the same fields as the single-create endpoint
+        current_user (dict): Current authenticated user from JWT token
+        db (Session): SQLAlchemy database session
+
+    Returns:
+        list[schemas.BookingResponse]: Created bookings in request order
+
+    Raises:
+        HTTPException(400): Batch too large or a row fails time/date validation
+        HTTPException(404): A referenced room does not exist
+        HTTPException(409): A row conflicts with an existing booking or
+            with another row in the batch
+
+    Example:
+        POST /api/bookings/bulk
+        Authorization: Bearer <token>
+        [
+            {"room_id": 5, "booking_date": "2024-02-15",
+             "start_time": "14:00:00", "end_time": "15:00:00",
+             "purpose": "Weekly sync"},
+            {"room_id": 5, "booking_date": "2024-02-22",
+             "start_time": "14:00:00", "end_time": "15:00:00",
+             "purpose": "Weekly sync"}
+        ]
+    """
+    return BookingService.create_bookings_bulk(db, bookings_data, current_user)
 
 @router.get(
     "/",
-    response_model=List[schemas.BookingResponse],
+    # Serialized directly via ORJSONResponse below; documented shape is
+    # still List[BookingResponse]
+    response_model=None,
+    responses={200: {"model": List[schemas.BookingResponse]}},
     summary="Get bookings",
     description="Retrieve bookings (users see own, admins see all)"
 )
-async def get_bookings(
+def get_bookings(
     room_id: Optional[int] = Query(None, description="Filter by room ID"),
     date: Optional[date_type] = Query(None, description="Filter by date"),
     status: Optional[str] = Query(None, description="Filter by status"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum rows per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor header"),
     current_user: dict = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -180,35 +221,54 @@ async def get_bookings(
         GET /api/bookings/?date=2024-02-15 - Get bookings on specific date
         GET /api/bookings/?status=confirmed - Get confirmed bookings only
     """
-    try:
-        # Determine which bookings user can see
-        if current_user["role"] in ["admin", "facility_manager"]:
-            # Admin/manager sees all bookings with filters
-            bookings = BookingService.get_all_bookings(
-                db, room_id=room_id, date=date, status=status
-            )
-        else:
-            # Regular user sees only their bookings
-            bookings = BookingService.get_user_bookings(
-                db, current_user["user_id"], status=status
+    # Decode the keyset cursor before touching the database
+    keyset = None
+    if cursor:
+        try:
+            keyset = decode_booking_cursor(cursor)
+        except ValueError:
+            # Literal 400: the `status` query parameter shadows the
+            # fastapi.status module inside this handler
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid pagination cursor"
             )
-        
-        return bookings
-    
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+
+    # Determine which bookings user can see
+    if current_user["role"] in ["admin", "facility_manager"]:
+        # Admin/manager sees all bookings with filters
+        bookings = BookingService.get_all_bookings(
+            db, room_id=room_id, date=date, status=status,
+            limit=limit, cursor=keyset
+        )
+    else:
+        # Regular user sees only their bookings
+        bookings = BookingService.get_user_bookings(
+            db, current_user["user_id"], status=status,
+            limit=limit, cursor=keyset
         )
 
+    # A full page means there may be more: hand back the keyset of the
+    # last row so the client can resume without OFFSET
+    headers = {}
+    if len(bookings) == limit:
+        last = bookings[-1]
+        headers["X-Next-Cursor"] = encode_booking_cursor(
+            last.booking_date, last.booking_id
+        )
+
+    return ORJSONResponse(_booking_rows_payload(bookings), headers=headers)
+
 @router.get(
     "/{booking_id}",
     response_model=schemas.BookingResponse,
     summary="Get booking by ID",
     description="Retrieve specific booking details"
 )
-async def get_booking(
+def get_booking(
     booking_id: int,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -252,17 +312,20 @@ async def get_booking(
         GET /api/bookings/42
         Authorization: Bearer <token>
     """
-    try:
-        # Get booking
-        booking = BookingService.get_booking_by_id(db, booking_id)
-        
-        # Check authorization
-        BookingService.check_booking_authorization(booking, current_user)
-        
-        return booking
-    
-    except (BookingNotFoundException, UnauthorizedBookingAccessException) as e:
-        raise e
+    # Get booking
+    booking = BookingService.get_booking_by_id(db, booking_id)
+
+    # Check authorization
+    BookingService.check_booking_authorization(booking, current_user)
+
+    # Conditional GET: detail pages are polled and rarely change, so an
+    # unchanged row answers 304 without serializing the response
+    etag = BookingService.booking_etag(booking)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    response.headers["ETag"] = etag
+
+    return booking
 
 @router.put(
     "/{booking_id}",
@@ -270,7 +333,7 @@ async def get_booking(
     summary="Update booking",
     description="Modify booking times or purpose"
 )
-async def update_booking(
+def update_booking(
     booking_id: int,
     update_data: schemas.BookingUpdate,
     current_user: dict = Depends(auth.get_current_user),
@@ -339,25 +402,7 @@ async def update_booking(
     - 404: Booking not found
     - 409: New time conflicts with existing booking
     """
-    try:
-        updated_booking = BookingService.update_booking(
-            db, booking_id, update_data, current_user
-        )
-        return updated_booking
-    
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    
-    except (
-        BookingNotFoundException,
-        UnauthorizedBookingAccessException,
-        InvalidBookingStateException,
-        BookingConflictException
-    ) as e:
-        raise e
+    return BookingService.update_booking(db, booking_id, update_data, current_user)
 
 @router.delete(
     "/{booking_id}",
@@ -365,7 +410,7 @@ async def update_booking(
     summary="Cancel booking",
     description="Cancel a booking (soft delete)"
 )
-async def cancel_booking(
+def cancel_booking(
     booking_id: int,
     current_user: dict = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
@@ -414,36 +459,82 @@ async def cancel_booking(
             "cancelled_at": "2024-02-28T10:15:00"
         }
     """
-    try:
-        cancelled_booking = BookingService.cancel_booking(
-            db, booking_id, current_user
-        )
-        
-        return {
-            "message": "Booking cancelled successfully",
-            "booking_id": booking_id,
-            "cancelled_at": cancelled_booking.cancelled_at
-        }
-    
-    except (
-        BookingNotFoundException,
-        UnauthorizedBookingAccessException,
-        InvalidBookingStateException
-    ) as e:
-        raise e
+    cancelled_booking = BookingService.cancel_booking(db, booking_id, current_user)
+
+    return {
+        "message": "Booking cancelled successfully",
+        "booking_id": booking_id,
+        "cancelled_at": cancelled_booking.cancelled_at
+    }
+
+@router.post(
+    "/cancel-bulk",
+    status_code=status.HTTP_200_OK,
+    summary="Cancel multiple bookings",
+    description="Cancel a batch of bookings (e.g. a recurring series) in one transaction"
+)
+def cancel_bookings_bulk(
+    booking_ids: List[int],
+    current_user: dict = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Cancel a batch of bookings in a single request.
+
+    Counterpart to POST /api/bookings/bulk for tearing down a recurring
+    series: one UPDATE covers every id and the audit rows ride the same
+    commit. All-or-nothing - any missing, forbidden, or
+    already-cancelled id rejects the whole batch.
+
+    Args:
+        booking_ids (list[int]): Up to 100 booking IDs to cancel
+        current_user (dict): Current authenticated user from JWT token
+        db (Session): SQLAlchemy database session
+
+    Returns:
+        dict: Confirmation with the cancelled IDs and shared timestamp
+
+    Raises:
+        HTTPException(400): Empty/oversized batch or an already-cancelled booking
+        HTTPException(403): A booking belongs to another user
+        HTTPException(404): A booking ID does not exist
+
+    Example:
+        POST /api/bookings/cancel-bulk
+        Authorization: Bearer <token>
+        [42, 43, 44]
+    """
+    cancelled_at = BookingService.cancel_bookings_bulk(db, booking_ids, current_user)
+
+    return {
+        "message": "Bookings cancelled successfully",
+        "booking_ids": booking_ids,
+        "cancelled_at": cancelled_at
+    }
 
-@cache_response(expire_seconds=60)
 @router.get(
     "/availability/check",
     response_model=schemas.AvailabilityResponse,
     summary="Check room availability",
     description="Verify if room is available for specified time"
 )
-async def check_availability(
+# Below @router.get so the registered handler is the cached wrapper
+# (the old order decorated dead code: the router had already captured
+# the undecorated function). Keyed on the query tuple only - the
+# caller's identity doesn't change availability - and mutations delete
+# the avail:room:date:* keys so a fresh booking is seen immediately.
+@cache_response(
+    expire_seconds=60,
+    key_func=lambda kw: (
+        f"avail:{kw['room_id']}:{kw['booking_date']}:"
+        f"{kw['start_time']}:{kw['end_time']}"
+    )
+)
+def check_availability(
     room_id: int = Query(..., description="Room ID to check"),
     booking_date: date_type = Query(..., description="Date to check (YYYY-MM-DD)"),
-    start_time: str = Query(..., description="Start time (HH:MM:SS)"),
-    end_time: str = Query(..., description="End time (HH:MM:SS)"),
+    start_time: time_type = Query(..., description="Start time (HH:MM:SS)"),
+    end_time: time_type = Query(..., description="End time (HH:MM:SS)"),
     current_user: dict = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -456,8 +547,8 @@ async def check_availability(
     Args:
         room_id (int): Query parameter - the room ID to check availability for
         booking_date (date): Query parameter - date to check (format: YYYY-MM-DD)
-        start_time (str): Query parameter - start time (format: HH:MM:SS)
-        end_time (str): Query parameter - end time (format: HH:MM:SS)
+        start_time (time): Query parameter - start time (format: HH:MM:SS)
+        end_time (time): Query parameter - end time (format: HH:MM:SS)
         current_user (dict): Current authenticated user from JWT token (FastAPI dependency)
             Contains: user_id, username, role
         db (Session): SQLAlchemy database session (FastAPI dependency injection)
@@ -472,7 +563,7 @@ async def check_availability(
             - message (str): "Available" or "Time slot is already booked"
     
     Raises:
-        HTTPException(400): Invalid time format or other validation error
+        HTTPException(422): Invalid time format (rejected by request validation)
         HTTPException(500): Unexpected server error
     
     Query Parameter Examples:
@@ -483,41 +574,38 @@ async def check_availability(
         - Cache key includes room_id, date, and time range
         - Reduces repeated database queries during rapid checking
     """
-    try:
-        # Parse time strings
-        from datetime import time as time_type
-        start = time_type.fromisoformat(start_time)
-        end = time_type.fromisoformat(end_time)
-        
-        # Check availability
-        is_available = BookingService.check_availability(
-            db, room_id, booking_date, start, end
-        )
-        
-        return schemas.AvailabilityResponse(
-            available=is_available,
-            room_id=room_id,
-            date=booking_date,
-            start_time=start,
-            end_time=end,
-            message="Available" if is_available else "Time slot is already booked"
-        )
-    
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid time format: {str(e)}"
-        )
+    # Times arrive already parsed: pydantic validates HH:MM:SS at the
+    # framework boundary (422 on bad input), so no fromisoformat here
+    is_available = BookingService.check_availability(
+        db, room_id, booking_date, start_time, end_time
+    )
+
+    return schemas.AvailabilityResponse(
+        available=is_available,
+        room_id=room_id,
+        date=booking_date,
+        start_time=start_time,
+        end_time=end_time,
+        message="Available" if is_available else "Time slot is already booked"
+    )
 
 @router.get(
     "/room/{room_id}/schedule",
-    response_model=List[schemas.BookingResponse],
+    # Serialized directly via ORJSONResponse below; documented shape is
+    # still the schedule/booking-list union
+    response_model=None,
+    responses={200: {"model": Union[schemas.RoomScheduleResponse, List[schemas.BookingResponse]]}},
     summary="Get room schedule",
     description="Get all bookings for a room on specific date"
 )
-async def get_room_schedule(
+def get_room_schedule(
     room_id: int,
+    request: Request,
     date: Optional[date_type] = Query(None, description="Date (defaults to today)"),
+    include_availability: bool = Query(
+        False,
+        description="Also return free 15-minute slots between 08:00 and 20:00"
+    ),
     current_user: dict = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -561,32 +649,44 @@ async def get_room_schedule(
         GET /api/bookings/room/5/schedule - Get today's schedule for room 5
         GET /api/bookings/room/5/schedule?date=2024-02-15 - Get schedule for specific date
     """    
-    try:
-        # Default to today if no date provided
-        if date is None:
-            from datetime import datetime
-            date = datetime.now().date()
-        
-        bookings = BookingService.get_room_schedule(db, room_id, date)
-        return bookings
-    
-    except HTTPException:
-        raise
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
+    # Default to today if no date provided
+    if date is None:
+        date = date_type.today()
+
+    # Conditional GET: a cheap count/max aggregate decides whether the
+    # client's cached copy is still current before fetching rows
+    etag = BookingService.get_schedule_etag(db, room_id, date)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    headers = {"ETag": etag}
+
+    bookings = BookingService.get_room_schedule(db, room_id, date)
+
+    if include_availability:
+        # Free slots are derived from the rows just fetched - one
+        # request and one query replace the schedule-then-per-slot
+        # availability waterfall
+        return ORJSONResponse({
+            "room_id": room_id,
+            "date": date,
+            "bookings": _booking_rows_payload(bookings),
+            "available_slots": BookingService.compute_available_slots(bookings)
+        }, headers=headers)
+
+    return ORJSONResponse(_booking_rows_payload(bookings), headers=headers)
 
 @router.get(
     "/{booking_id}/history",
-    response_model=List[schemas.BookingHistoryResponse],
+    # Serialized directly via ORJSONResponse below; documented shape is
+    # still List[BookingHistoryResponse]
+    response_model=None,
+    responses={200: {"model": List[schemas.BookingHistoryResponse]}},
     summary="Get booking history",
     description="Get audit trail of booking modifications"
 )
-async def get_booking_history(
+def get_booking_history(
     booking_id: int,
+    request: Request,
     current_user: dict = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -648,30 +748,38 @@ async def get_booking_history(
             }
         ]
     """
-    try:
-        # Get booking to check authorization
-        booking = BookingService.get_booking_by_id(db, booking_id)
-        
-        # Check authorization (allow auditors too)
-        if (current_user["role"] not in ["admin", "facility_manager", "auditor"] and 
-            booking.user_id != current_user["user_id"]):
-            raise UnauthorizedBookingAccessException()
-        
-        # Get history
-        history = BookingService.get_booking_history(db, booking_id)
-        return history
-    
-    except (BookingNotFoundException, UnauthorizedBookingAccessException) as e:
-        raise e
+    # Get booking to check authorization
+    booking = BookingService.get_booking_by_id(db, booking_id)
+
+    # Check authorization (allow auditors too)
+    if (current_user["role"] not in ["admin", "facility_manager", "auditor"] and
+        booking.user_id != current_user["user_id"]):
+        raise UnauthorizedBookingAccessException()
+
+    # Conditional GET: history is append-only, so (count, latest
+    # timestamp) identifies the trail exactly
+    etag = BookingService.get_history_etag(db, booking_id)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+
+    # Get history; the query selects exactly the response columns, so
+    # the rows go straight to orjson without output validation
+    rows = BookingService.get_booking_history(db, booking_id)
+    return ORJSONResponse(_booking_rows_payload(rows), headers={"ETag": etag})
 
 @router.get(
     "/user/{user_id}/history",
-    response_model=List[schemas.BookingResponse],
+    # Serialized directly via ORJSONResponse below; documented shape is
+    # still List[BookingResponse]
+    response_model=None,
+    responses={200: {"model": List[schemas.BookingResponse]}},
     summary="Get user booking history",
     description="Get all bookings for a specific user"
 )
-async def get_user_booking_history(
+def get_user_booking_history(
     user_id: int,
+    limit: int = Query(50, ge=1, le=200, description="Maximum rows per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor header"),
     current_user: dict = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -728,16 +836,33 @@ async def get_user_booking_history(
             }
         ]
     """
-    try:
-        # Check authorization
-        if (current_user["role"] not in ["admin", "facility_manager"] and 
-            current_user["user_id"] != user_id):
-            raise UnauthorizedBookingAccessException(
-                "You can only view your own booking history"
+    # Check authorization
+    if (current_user["role"] not in ["admin", "facility_manager"] and
+        current_user["user_id"] != user_id):
+        raise UnauthorizedBookingAccessException(
+            "You can only view your own booking history"
+        )
+
+    keyset = None
+    if cursor:
+        try:
+            keyset = decode_booking_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
             )
-        
-        bookings = BookingService.get_user_bookings(db, user_id)
-        return bookings
-    
-    except UnauthorizedBookingAccessException as e:
-        raise e
+
+    bookings = BookingService.get_user_bookings(
+        db, user_id, limit=limit, cursor=keyset
+    )
+
+    # Full page: expose the keyset of the last row for the next page
+    headers = {}
+    if len(bookings) == limit:
+        last = bookings[-1]
+        headers["X-Next-Cursor"] = encode_booking_cursor(
+            last.booking_date, last.booking_id
+        )
+
+    return ORJSONResponse(_booking_rows_payload(bookings), headers=headers)
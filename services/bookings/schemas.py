@@ -4,8 +4,8 @@ These schemas validate incoming data and structure API responses.
 
 Author: Dana Kossaybati
 """
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import Literal, Optional, List
 from datetime import date, time, datetime
 
 class BookingCreate(BaseModel):
@@ -13,6 +13,11 @@ class BookingCreate(BaseModel):
     Schema for creating a new booking.
     Validates all required fields before reservation is created.
     """
+    # frozen skips __set__ machinery and enables the fast construction
+    # path; extra='forbid' both rejects junk keys and drops the
+    # per-field extras walk on every request
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
     room_id: int = Field(
         ...,
         gt=0,
@@ -36,17 +41,18 @@ class BookingCreate(BaseModel):
         description="Optional meeting purpose/description"
     )
     
-    @field_validator('end_time')
-    @classmethod
-    def validate_time_order(cls, v, info):
+    @model_validator(mode='after')
+    def validate_time_order(self):
         """
         Ensure end_time is after start_time.
-        Pydantic validator runs before business logic.
+
+        An after-model validator with direct attribute access keeps the
+        per-field pipeline all-Rust; the old field_validator inserted a
+        Python frame plus an info.data dict walk into every validation.
         """
-        # Access start_time from values context
-        if 'start_time' in info.data and v <= info.data['start_time']:
+        if self.end_time <= self.start_time:
             raise ValueError('End time must be after start time')
-        return v
+        return self
 
 class BookingUpdate(BaseModel):
     """
@@ -78,7 +84,8 @@ class BookingResponse(BaseModel):
     booking_date: date
     start_time: time
     end_time: time
-    status: str
+    # Mirrors the booking_status enum column
+    status: Literal["pending", "confirmed", "cancelled", "completed"]
     purpose: Optional[str]
     created_at: datetime
     updated_at: Optional[datetime]
@@ -116,6 +123,25 @@ class AvailabilityResponse(BaseModel):
         description="Additional information about availability"
     )
 
+class AvailableSlot(BaseModel):
+    """
+    Schema for one free time slot in a room schedule.
+    Produced when a schedule is requested with include_availability.
+    """
+    start_time: time
+    end_time: time
+
+class RoomScheduleResponse(BaseModel):
+    """
+    Schema for a room schedule with precomputed free slots.
+    Lets clients render a day view from one request instead of a
+    schedule call followed by per-slot availability checks.
+    """
+    room_id: int
+    date: date
+    bookings: List[BookingResponse]
+    available_slots: List[AvailableSlot]
+
 class BookingHistoryResponse(BaseModel):
     """
     Schema for booking history records.
@@ -123,7 +149,8 @@ class BookingHistoryResponse(BaseModel):
     """
     history_id: int
     booking_id: int
-    action: str
+    # Mirrors the booking_action enum column
+    action: Literal["created", "updated", "cancelled", "completed"]
     previous_start_time: Optional[time]
     previous_end_time: Optional[time]
     new_start_time: Optional[time]
@@ -9,15 +9,29 @@ This follows the Service Layer pattern:
 
 Author: Dana Kossaybati
 """
+from redis import RedisError
+from sqlalchemy import bindparam, func, insert, literal, select, tuple_, update, Date, DateTime, Time
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from datetime import datetime, date as date_type, time as time_type
+from collections import defaultdict
+from datetime import datetime, timedelta, date as date_type, time as time_type
+from threading import Lock
+from time import monotonic
 from typing import Optional, List
-import httpx
-import os
+import hashlib
+import logging
 
 from models import Booking, Room, BookingHistory
 import schemas
-from utils import sanitize_input, validate_booking_time, times_overlap
+from utils import (
+    sanitize_input,
+    validate_booking_time,
+    times_overlap,
+    any_overlap,
+    redis_client,
+    REDIS_AVAILABLE
+)
 from errors import (
     BookingNotFoundException,
     BookingConflictException,
@@ -26,42 +40,120 @@ from errors import (
     InvalidBookingStateException
 )
 
-# Environment variables for inter-service communication
-ROOMS_SERVICE_URL = os.getenv("ROOMS_SERVICE_URL", "http://localhost:8002")
+logger = logging.getLogger(__name__)
+
+# Positive-only TTL cache for room-existence lookups: room_id -> (checked_at,
+# Room). Rooms change on the order of days, but every booking create and
+# schedule lookup re-verifies the same handful of popular rooms. Only
+# successful lookups are cached, so a freshly created room or a room flipped
+# to maintenance is picked up immediately; a stale positive merely delays
+# noticing a deleted room by at most the TTL.
+_ROOM_CACHE_TTL = 60  # seconds
+_room_cache = {}
+
+# Micro-TTL cache for availability checks: (room, date, start, end) ->
+# (checked_at, available). Time-picker widgets hammer the same slot from
+# many clients within seconds; two seconds of staleness is invisible in
+# the UI but collapses those bursts to one query. The per-key lock
+# coalesces concurrent identical requests (threadpool handlers), so N
+# simultaneous checks cost one DB round trip, not N. Mutations for a
+# room/date invalidate the affected keys immediately.
+_AVAILABILITY_TTL = 2  # seconds
+_availability_cache = {}
+_availability_locks = defaultdict(Lock)
+
+# Status sets for the IN() predicates, hoisted so the hot query paths
+# load one module constant instead of rebuilding a list per request.
+# "Active" = rows that block a slot; schedules additionally show
+# completed meetings.
+_ACTIVE_STATUSES = ('confirmed', 'pending')
+_SCHEDULE_STATUSES = ('confirmed', 'pending', 'completed')
+
+# Bound method reference: skips the datetime attribute lookup on every
+# timestamp. Each mutating operation calls it once and reuses the value
+# so a booking row and its audit record always carry identical times.
+_utcnow = datetime.utcnow
+
+# Column tuples for the read-only list queries. Selecting columns instead
+# of entities returns plain Row objects - no identity-map bookkeeping or
+# attribute instrumentation - which pydantic consumes just as happily via
+# from_attributes. The tuples match the response schemas field-for-field.
+_BOOKING_COLUMNS = (
+    Booking.booking_id,
+    Booking.user_id,
+    Booking.room_id,
+    Booking.booking_date,
+    Booking.start_time,
+    Booking.end_time,
+    Booking.status,
+    Booking.purpose,
+    Booking.created_at,
+    Booking.updated_at,
+    Booking.cancelled_at,
+)
+
+_HISTORY_COLUMNS = (
+    BookingHistory.history_id,
+    BookingHistory.booking_id,
+    BookingHistory.action,
+    BookingHistory.previous_start_time,
+    BookingHistory.previous_end_time,
+    BookingHistory.new_start_time,
+    BookingHistory.new_end_time,
+    BookingHistory.changed_by,
+    BookingHistory.timestamp,
+)
+
+# Statements for the hottest point lookups, built once at import with
+# explicit bindparams. Constructing the select per call re-derives the
+# SQL cache key from the expression tree every time; a module-level
+# statement is hashed once and hits the compiled-SQL cache directly.
+_SELECT_BOOKING_BY_ID = select(Booking).where(
+    Booking.booking_id == bindparam("id")
+)
+_SELECT_HISTORY_BY_BOOKING = select(*_HISTORY_COLUMNS).where(
+    BookingHistory.booking_id == bindparam("id")
+).order_by(BookingHistory.timestamp.desc())
 
 class BookingService:
     """
     Service class containing all booking-related business logic.
     Keeps routes thin and business logic testable.
     """
-    
+
     @staticmethod
     def verify_room_exists(room_id: int, db: Session) -> Room:
         """
         Verify room exists and is available for booking.
-        Queries rooms table directly (shared database approach).
-        
+        Queries rooms table directly (shared database approach), with a
+        short positive-only cache in front of the query.
+
         Args:
             room_id: Room identifier to verify
             db: Database session
-            
+
         Returns:
             Room object if exists and available
-            
+
         Raises:
             RoomNotFoundException: If room doesn't exist or unavailable
         """
+        cached = _room_cache.get(room_id)
+        if cached is not None and monotonic() - cached[0] < _ROOM_CACHE_TTL:
+            return cached[1]
+
         room = db.query(Room).filter(Room.room_id == room_id).first()
-        
+
         if not room:
             raise RoomNotFoundException(f"Room with ID {room_id} not found")
-        
+
         # Check room status - only 'available' rooms can be booked
         if room.status != 'available':
             raise RoomNotFoundException(
                 f"Room '{room.room_name}' is currently {room.status} and cannot be booked"
             )
-        
+
+        _room_cache[room_id] = (monotonic(), room)
         return room
     
     @staticmethod
@@ -91,91 +183,69 @@ class BookingService:
         
         Returns:
             True if conflict exists, False if time slot is available
-        
+
         Performance note:
-            Query is optimized with indexes on (room_id, booking_date, status)
+            The half-open overlap predicate runs inside the partial
+            index ix_bookings_active (room, date, start, end), so the
+            existence check is an index-only scan returning one boolean
+            - no rows cross the wire however busy the room is.
         """
-        # Query for potentially conflicting bookings
-        query = db.query(Booking).filter(
+        conflicting = select(Booking.booking_id).where(
             Booking.room_id == room_id,
             Booking.booking_date == booking_date,
             # Only check active bookings (not cancelled)
-            Booking.status.in_(['confirmed', 'pending'])
+            Booking.status.in_(_ACTIVE_STATUSES),
+            # Overlap: existing starts before we end AND ends after we start
+            Booking.start_time < end_time,
+            Booking.end_time > start_time
         )
-        
+
         # Exclude specific booking (for update operations)
         if exclude_booking_id:
-            query = query.filter(Booking.booking_id != exclude_booking_id)
-        
-        # Get all potentially conflicting bookings
-        existing_bookings = query.all()
-        
-        # Check each existing booking for time overlap
-        for booking in existing_bookings:
-            if times_overlap(
-                start_time, end_time,
-                booking.start_time, booking.end_time
-            ):
-                # Conflict found!
-                return True
-        
-        # No conflicts found
-        return False
+            conflicting = conflicting.where(
+                Booking.booking_id != exclude_booking_id
+            )
+
+        return db.execute(select(conflicting.exists())).scalar()
     
     @staticmethod
-    def log_booking_history(
-        db: Session,
-        booking_id: int,
-        user_id: int,
-        room_id: int,
-        action: str,
-        changed_by: int,
-        prev_start: Optional[time_type] = None,
-        prev_end: Optional[time_type] = None,
-        new_start: Optional[time_type] = None,
-        new_end: Optional[time_type] = None
-    ):
+    def _append_history(db: Session, rows: List[dict], commit: bool = True):
         """
-        Log booking changes to history table for audit trail.
-        
-        Creates immutable record of all booking modifications.
-        Useful for: debugging, accountability, analytics, compliance.
-        
+        Write history rows with one Core INSERT (executemany for batches).
+
+        History rows are write-only audit records - nothing reads them back
+        in the same request - so the ORM unit of work (identity map,
+        per-row flush and RETURNING) is pure overhead. A Core insert sends
+        a single multi-row statement however many bookings changed.
+
+        With commit=False the insert is staged into the caller's open
+        transaction: the mutation and its audit row share one commit and
+        succeed or fail together.
+
         Args:
             db: Database session
-            booking_id: Booking being modified
-            user_id: Original booking owner
-            room_id: Room being booked
-            action: Type of change (created, updated, cancelled, completed)
-            changed_by: User making the change
-            prev_start: Previous start time (for updates)
-            prev_end: Previous end time (for updates)
-            new_start: New start time (for updates/creation)
-            new_end: New end time (for updates/creation)
+            rows: List of column dicts, one per history record
+            commit: Commit here (best-effort, post-mutation) or leave
+                the rows for the caller's transaction
         """
+        if not rows:
+            return
+        if not commit:
+            db.execute(insert(BookingHistory), rows)
+            return
         try:
-            history_record = BookingHistory(
-                booking_id=booking_id,
-                user_id=user_id,
-                room_id=room_id,
-                action=action,
-                previous_start_time=prev_start,
-                previous_end_time=prev_end,
-                new_start_time=new_start,
-                new_end_time=new_end,
-                changed_by=changed_by,
-                timestamp=datetime.utcnow()
-            )
-            db.add(history_record)
+            db.execute(insert(BookingHistory), rows)
             db.commit()
-        except Exception as e:
+        except SQLAlchemyError:
             # Log error but don't fail the main operation
-            # History is important but not critical
-            print(f"Warning: Failed to log booking history: {e}")
+            # History is important but not critical. Narrowed to DB
+            # errors: cancellations and programming errors must not be
+            # swallowed here
+            logger.exception("Failed to log booking history")
             db.rollback()
     
     @staticmethod
-    async def create_booking(
+    def create_booking(
         db: Session,
         booking_data: schemas.BookingCreate,
         current_user: dict
@@ -212,55 +282,262 @@ class BookingService:
         if not is_valid:
             raise ValueError(error_msg)
         
-        # Step 2: Verify room exists
-        room_exists = BookingService.verify_room_exists(booking_data.room_id, db)
-        if not room_exists:
-            raise RoomNotFoundException(booking_data.room_id)
-        
-        # Step 3: Check for booking conflicts
-        has_conflict = BookingService.check_booking_conflict(
-            db,
-            booking_data.room_id,
-            booking_data.booking_date,
-            booking_data.start_time,
-            booking_data.end_time
-        )
-        if has_conflict:
-            raise BookingConflictException()
-        
-        # Step 4: Create booking record
+        # Steps 2-4: Room check, conflict check and insert in ONE statement.
+        # INSERT ... SELECT <values> WHERE EXISTS(<room available>) AND NOT
+        # EXISTS(<overlap>) RETURNING collapses the room-verification and
+        # conflict-check round trips and closes the read-then-insert race:
+        # both predicates are evaluated inside the insert itself, so no row
+        # is written when the room is unusable or the slot is taken. The
+        # cold path below disambiguates which predicate failed.
         # Sanitize purpose text (defense in depth)
         purpose = sanitize_input(booking_data.purpose) if booking_data.purpose else None
-        
-        new_booking = Booking(
-            user_id=current_user["user_id"],
-            room_id=booking_data.room_id,
-            booking_date=booking_data.booking_date,
-            start_time=booking_data.start_time,
-            end_time=booking_data.end_time,
-            purpose=purpose,
-            status="confirmed",  # Auto-confirm (no approval workflow)
-            created_at=datetime.utcnow()
-        )
-        
-        db.add(new_booking)
-        db.commit()
-        db.refresh(new_booking)  # Get auto-generated fields
-        
-        # Step 5: Log to history table
-        BookingService.log_booking_history(
-            db,
-            booking_id=new_booking.booking_id,
-            user_id=current_user["user_id"],
-            room_id=booking_data.room_id,
-            action="created",
-            changed_by=current_user["user_id"],
-            new_start=booking_data.start_time,
-            new_end=booking_data.end_time
+
+        # Serialize concurrent attempts on the same room/date with a short
+        # Redis lock. The guarded insert below is what guarantees
+        # correctness; the lock just orders bursts so at most one of the
+        # competing transactions does conflict work, instead of all of
+        # them racing and all but one rolling back. If Redis is down or
+        # the lock cannot be acquired in time, proceed without it.
+        lock = None
+        if REDIS_AVAILABLE:
+            lock = redis_client.lock(
+                f"book:{booking_data.room_id}:{booking_data.booking_date}",
+                timeout=2,           # Auto-expire: a crashed holder can't wedge the room
+                blocking_timeout=1   # Give up quickly and fall through to the DB guard
+            )
+            if not lock.acquire():
+                lock = None
+
+        # The lock must cover the COMMIT, not just the insert: released
+        # earlier, a competitor acquires it while this transaction is
+        # still uncommitted, its NOT EXISTS guard can't see the row yet,
+        # and it runs straight into the exclusion constraint - the
+        # retry-storm 500 the lock exists to prevent
+        now = _utcnow()
+        try:
+            new_booking = BookingService._insert_if_free(
+                db, booking_data, current_user, purpose, now
+            )
+
+            if new_booking is None:
+                # Zero rows: either the room is missing/unavailable or
+                # the slot is taken. One follow-up read on this cold
+                # path picks the right error (and raises
+                # RoomNotFoundException itself)
+                db.rollback()
+                BookingService.verify_room_exists(booking_data.room_id, db)
+                raise BookingConflictException()
+
+            # Step 5: Stage the audit row into the open transaction. The
+            # RETURNING insert already populated booking_id, so the
+            # booking and its history share a single commit (one fsync,
+            # one round trip) and can never diverge.
+            BookingService._append_history(db, [{
+                "booking_id": new_booking.booking_id,
+                "user_id": current_user["user_id"],
+                "room_id": booking_data.room_id,
+                "action": "created",
+                "previous_start_time": None,
+                "previous_end_time": None,
+                "new_start_time": booking_data.start_time,
+                "new_end_time": booking_data.end_time,
+                "changed_by": current_user["user_id"],
+                "timestamp": now
+            }], commit=False)
+            db.commit()
+        finally:
+            if lock is not None:
+                try:
+                    lock.release()
+                except RedisError:
+                    pass  # Lock expired mid-request; nothing to release
+
+        BookingService._invalidate_availability(
+            booking_data.room_id, booking_data.booking_date
         )
-        
+
         return new_booking
-    
+
+    @staticmethod
+    def create_bookings_bulk(
+        db: Session,
+        bookings_data: List[schemas.BookingCreate],
+        current_user: dict
+    ) -> List[Booking]:
+        """
+        Create a batch of bookings (e.g. a recurring weekly meeting) in
+        one transaction.
+
+        One conflict query covers every (room, date) pair in the batch
+        and one multi-row INSERT writes all rows, so creating N
+        occurrences costs a constant number of round trips and a single
+        commit instead of N separate calls. All-or-nothing: any
+        validation failure or conflict rejects the whole batch.
+
+        Args:
+            db: Database session
+            bookings_data: Bookings to create (at most 100)
+            current_user: Authenticated user making the bookings
+
+        Returns:
+            List of created Booking instances, in request order
+
+        Raises:
+            ValueError: If the batch is too large or a row fails
+                time/date validation
+            RoomNotFoundException: If any room doesn't exist
+            BookingConflictException: If a row conflicts with an
+                existing booking or with another row in the batch
+        """
+        if not bookings_data:
+            return []
+        if len(bookings_data) > 100:
+            raise ValueError("Bulk create is limited to 100 bookings per request")
+
+        # Validate every row before touching the database
+        for item in bookings_data:
+            is_valid, error_msg = validate_booking_time(
+                item.booking_date, item.start_time, item.end_time
+            )
+            if not is_valid:
+                raise ValueError(error_msg)
+
+        # Each distinct room once (the TTL cache absorbs repeats)
+        for room_id in {item.room_id for item in bookings_data}:
+            BookingService.verify_room_exists(room_id, db)
+
+        # Rows within the batch must not overlap each other either
+        for i, first in enumerate(bookings_data):
+            for second in bookings_data[i + 1:]:
+                if (first.room_id == second.room_id
+                        and first.booking_date == second.booking_date
+                        and times_overlap(
+                            first.start_time, first.end_time,
+                            second.start_time, second.end_time
+                        )):
+                    raise BookingConflictException(
+                        "Bookings within the batch overlap each other"
+                    )
+
+        # One query fetches every active booking that could conflict
+        # with any row in the batch
+        pairs = {(item.room_id, item.booking_date) for item in bookings_data}
+        existing = db.execute(
+            select(
+                Booking.room_id,
+                Booking.booking_date,
+                Booking.start_time,
+                Booking.end_time
+            ).where(
+                tuple_(Booking.room_id, Booking.booking_date).in_(list(pairs)),
+                Booking.status.in_(_ACTIVE_STATUSES)
+            )
+        ).all()
+
+        busy = defaultdict(list)
+        for row in existing:
+            busy[(row.room_id, row.booking_date)].append(
+                (row.start_time, row.end_time)
+            )
+
+        for item in bookings_data:
+            if any_overlap(
+                busy[(item.room_id, item.booking_date)],
+                item.start_time, item.end_time
+            ):
+                raise BookingConflictException()
+
+        # Single multi-row INSERT and one commit. A concurrent writer
+        # slipping between the check and the insert is caught by the
+        # database-level exclusion constraint.
+        now = _utcnow()
+        new_bookings = [
+            Booking(
+                user_id=current_user["user_id"],
+                room_id=item.room_id,
+                booking_date=item.booking_date,
+                start_time=item.start_time,
+                end_time=item.end_time,
+                status="confirmed",
+                purpose=sanitize_input(item.purpose) if item.purpose else None,
+                created_at=now
+            )
+            for item in bookings_data
+        ]
+        db.add_all(new_bookings)
+        db.commit()
+
+        for room_id, booking_date in pairs:
+            BookingService._invalidate_availability(room_id, booking_date)
+
+        # One executemany INSERT for the whole batch's audit trail
+        BookingService._append_history(db, [
+            {
+                "booking_id": booking.booking_id,
+                "user_id": booking.user_id,
+                "room_id": booking.room_id,
+                "action": "created",
+                "previous_start_time": None,
+                "previous_end_time": None,
+                "new_start_time": booking.start_time,
+                "new_end_time": booking.end_time,
+                "changed_by": current_user["user_id"],
+                "timestamp": now
+            }
+            for booking in new_bookings
+        ])
+
+        return new_bookings
+
+    @staticmethod
+    def _insert_if_free(
+        db: Session,
+        booking_data: schemas.BookingCreate,
+        current_user: dict,
+        purpose: Optional[str],
+        now: datetime
+    ) -> Optional[Booking]:
+        """
+        Run the guarded INSERT ... WHERE EXISTS(room available) AND NOT
+        EXISTS(overlap) RETURNING.
+
+        Returns the new Booking, or None when the insert wrote no row -
+        either the room is missing/unavailable or the slot is taken;
+        the caller disambiguates.
+        """
+        room_available = select(Room.room_id).where(
+            Room.room_id == booking_data.room_id,
+            Room.status == 'available'
+        ).exists()
+
+        conflict_exists = select(Booking.booking_id).where(
+            Booking.room_id == booking_data.room_id,
+            Booking.booking_date == booking_data.booking_date,
+            Booking.status.in_(_ACTIVE_STATUSES),
+            # Overlap: existing starts before we end AND ends after we start
+            Booking.start_time < booking_data.end_time,
+            Booking.end_time > booking_data.start_time
+        ).exists()
+
+        insert_stmt = insert(Booking).from_select(
+            [
+                "user_id", "room_id", "booking_date", "start_time",
+                "end_time", "status", "purpose", "created_at"
+            ],
+            select(
+                literal(current_user["user_id"]),
+                literal(booking_data.room_id),
+                literal(booking_data.booking_date, Date),
+                literal(booking_data.start_time, Time),
+                literal(booking_data.end_time, Time),
+                literal("confirmed"),  # Auto-confirm (no approval workflow)
+                literal(purpose),
+                literal(now, DateTime(timezone=True))
+            ).where(room_available, ~conflict_exists)
+        ).returning(Booking)
+
+        return db.scalars(insert_stmt).first()
+
     @staticmethod
     def get_booking_by_id(db: Session, booking_id: int) -> Booking:
         """
@@ -276,85 +553,112 @@ class BookingService:
         Raises:
             BookingNotFoundException: If booking doesn't exist
         """
-        booking = db.query(Booking).filter(
-            Booking.booking_id == booking_id
+        booking = db.scalars(
+            _SELECT_BOOKING_BY_ID, {"id": booking_id}
         ).first()
-        
+
         if not booking:
             raise BookingNotFoundException(booking_id)
-        
+
         return booking
     
     @staticmethod
     def get_user_bookings(
         db: Session,
         user_id: int,
-        status: Optional[str] = None
-    ) -> List[Booking]:
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[tuple] = None
+    ) -> List[Row]:
         """
-        Get all bookings for a specific user.
-        
+        Get bookings for a specific user, newest first.
+
+        Supports keyset pagination: pass the (booking_date, booking_id) of
+        the last row of the previous page as `cursor` and the query resumes
+        below it with an index range scan - no OFFSET walk over skipped rows.
+
         Args:
             db: Database session
             user_id: User ID to filter by
             status: Optional status filter (confirmed, cancelled, etc.)
-        
+            limit: Optional maximum number of rows to return
+            cursor: Optional (booking_date, booking_id) keyset to resume after
+
         Returns:
-            List of Booking models
+            List of booking rows (column tuples, not ORM instances)
         """
-        query = db.query(Booking).filter(
+        stmt = select(*_BOOKING_COLUMNS).where(
             Booking.user_id == user_id
         )
-        
+
         if status:
-            query = query.filter(Booking.status == status)
-        
-        # Order by date (newest first)
-        bookings = query.order_by(
+            stmt = stmt.where(Booking.status == status)
+        if cursor:
+            stmt = stmt.where(
+                tuple_(Booking.booking_date, Booking.booking_id) < cursor
+            )
+
+        # Order by date (newest first); booking_id breaks ties so the
+        # keyset resumes deterministically within a day
+        stmt = stmt.order_by(
             Booking.booking_date.desc(),
-            Booking.start_time.desc()
-        ).all()
-        
-        return bookings
+            Booking.booking_id.desc()
+        )
+        if limit:
+            stmt = stmt.limit(limit)
+
+        return db.execute(stmt).all()
     
     @staticmethod
     def get_all_bookings(
         db: Session,
         room_id: Optional[int] = None,
         date: Optional[date_type] = None,
-        status: Optional[str] = None
-    ) -> List[Booking]:
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[tuple] = None
+    ) -> List[Row]:
         """
-        Get all bookings with optional filters.
-        
-        Used by admins/facility managers to view all bookings.
-        
+        Get all bookings with optional filters, newest first.
+
+        Used by admins/facility managers to view all bookings. Supports
+        the same (booking_date, booking_id) keyset pagination as
+        get_user_bookings.
+
         Args:
             db: Database session
             room_id: Optional room filter
             date: Optional date filter
             status: Optional status filter
-        
+            limit: Optional maximum number of rows to return
+            cursor: Optional (booking_date, booking_id) keyset to resume after
+
         Returns:
-            List of Booking models
+            List of booking rows (column tuples, not ORM instances)
         """
-        query = db.query(Booking)
-        
+        stmt = select(*_BOOKING_COLUMNS)
+
         # Apply filters
         if room_id:
-            query = query.filter(Booking.room_id == room_id)
+            stmt = stmt.where(Booking.room_id == room_id)
         if date:
-            query = query.filter(Booking.booking_date == date)
+            stmt = stmt.where(Booking.booking_date == date)
         if status:
-            query = query.filter(Booking.status == status)
-        
-        # Order by date and time
-        bookings = query.order_by(
+            stmt = stmt.where(Booking.status == status)
+        if cursor:
+            stmt = stmt.where(
+                tuple_(Booking.booking_date, Booking.booking_id) < cursor
+            )
+
+        # Order by date, booking_id as the keyset tiebreaker
+        stmt = stmt.order_by(
             Booking.booking_date.desc(),
-            Booking.start_time.desc()
-        ).all()
-        
-        return bookings
+            Booking.booking_id.desc()
+        )
+        if limit:
+            stmt = stmt.limit(limit)
+
+        return db.execute(stmt).all()
     
     @staticmethod
     def update_booking(
@@ -440,25 +744,31 @@ class BookingService:
             booking.purpose = sanitize_input(update_data.purpose)
         
         # Update timestamp
-        booking.updated_at = datetime.utcnow()
-        
+        booking.updated_at = _utcnow()
+
+        # Stage the audit row in the same transaction as the mutation:
+        # one commit instead of two, and the history can never diverge
+        # from the booking row it describes
+        BookingService._append_history(db, [{
+            "booking_id": booking.booking_id,
+            "user_id": booking.user_id,
+            "room_id": booking.room_id,
+            "action": "updated",
+            "previous_start_time": old_start,
+            "previous_end_time": old_end,
+            "new_start_time": booking.start_time,
+            "new_end_time": booking.end_time,
+            "changed_by": current_user["user_id"],
+            "timestamp": booking.updated_at
+        }], commit=False)
+
+        # No refresh: every changed column was assigned in Python and
+        # expire_on_commit is off, so the instance is already current
         db.commit()
-        db.refresh(booking)
-        
-        # Log to history
-        BookingService.log_booking_history(
-            db,
-            booking_id=booking.booking_id,
-            user_id=booking.user_id,
-            room_id=booking.room_id,
-            action="updated",
-            changed_by=current_user["user_id"],
-            prev_start=old_start,
-            prev_end=old_end,
-            new_start=booking.start_time,
-            new_end=booking.end_time
+        BookingService._invalidate_availability(
+            booking.room_id, booking.booking_date
         )
-        
+
         return booking
     
     @staticmethod
@@ -486,36 +796,148 @@ class BookingService:
             UnauthorizedBookingAccessException: If user lacks permission
             InvalidBookingStateException: If booking already cancelled
         """
-        # Get booking
-        booking = BookingService.get_booking_by_id(db, booking_id)
-        
-        # Check authorization
-        BookingService.check_booking_authorization(booking, current_user)
-        
-        # Check if already cancelled
-        if booking.status == "cancelled":
+        # Single conditional UPDATE ... RETURNING: state check,
+        # authorization and the write happen atomically in one round
+        # trip, so two concurrent cancels can't both see 'confirmed'
+        # and both succeed (no SELECT FOR UPDATE needed)
+        cancelled_at = _utcnow()
+        stmt = (
+            update(Booking)
+            .where(
+                Booking.booking_id == booking_id,
+                Booking.status != "cancelled"
+            )
+            .values(
+                status="cancelled",
+                cancelled_at=cancelled_at,
+                cancelled_by=current_user["user_id"],
+                updated_at=cancelled_at
+            )
+            .returning(Booking)
+        )
+        # Non-privileged callers may only touch their own rows; folding
+        # the ownership predicate in keeps the statement race-free too
+        if current_user["role"] not in ["admin", "facility_manager"]:
+            stmt = stmt.where(Booking.user_id == current_user["user_id"])
+
+        booking = db.scalars(stmt).first()
+
+        if booking is None:
+            # Zero rows: work out which 4xx applies with one follow-up
+            # read (the cold path - conflicts and retries only)
+            db.rollback()
+            existing = BookingService.get_booking_by_id(db, booking_id)
+            BookingService.check_booking_authorization(existing, current_user)
             raise InvalidBookingStateException("Booking is already cancelled")
-        
-        # Update status (soft delete)
-        booking.status = "cancelled"
-        booking.cancelled_at = datetime.utcnow()
-        booking.cancelled_by = current_user["user_id"]
-        booking.updated_at = datetime.utcnow()
-        
+
+        room_id, booking_date = booking.room_id, booking.booking_date
+
+        # Audit row rides the same commit as the status change
+        BookingService._append_history(db, [{
+            "booking_id": booking.booking_id,
+            "user_id": booking.user_id,
+            "room_id": booking.room_id,
+            "action": "cancelled",
+            "previous_start_time": None,
+            "previous_end_time": None,
+            "new_start_time": None,
+            "new_end_time": None,
+            "changed_by": current_user["user_id"],
+            "timestamp": cancelled_at
+        }], commit=False)
+
         db.commit()
-        db.refresh(booking)
-        
-        # Log to history
-        BookingService.log_booking_history(
-            db,
-            booking_id=booking.booking_id,
-            user_id=booking.user_id,
-            room_id=booking.room_id,
-            action="cancelled",
-            changed_by=current_user["user_id"]
-        )
-        
+        BookingService._invalidate_availability(room_id, booking_date)
+
         return booking
+
+    @staticmethod
+    def cancel_bookings_bulk(
+        db: Session,
+        booking_ids: List[int],
+        current_user: dict
+    ) -> datetime:
+        """
+        Cancel a batch of bookings in one transaction.
+
+        One UPDATE over the whole id list plus one executemany history
+        INSERT share a single commit - cancelling a recurring series
+        costs a constant number of round trips. All-or-nothing: every
+        id must exist, be owned (or the caller be admin), and not be
+        cancelled already.
+
+        Args:
+            db: Database session
+            booking_ids: Bookings to cancel (at most 100)
+            current_user: User cancelling the bookings
+
+        Returns:
+            The shared cancellation timestamp
+
+        Raises:
+            ValueError: If the batch is empty or too large
+            BookingNotFoundException: If any id doesn't exist
+            UnauthorizedBookingAccessException: If any booking isn't
+                accessible to the caller
+            InvalidBookingStateException: If any booking is already
+                cancelled
+        """
+        if not booking_ids:
+            raise ValueError("No booking IDs provided")
+        if len(booking_ids) > 100:
+            raise ValueError("Bulk cancel is limited to 100 bookings per request")
+
+        bookings = db.scalars(
+            select(Booking).where(Booking.booking_id.in_(booking_ids))
+        ).all()
+
+        found = {b.booking_id for b in bookings}
+        for booking_id in booking_ids:
+            if booking_id not in found:
+                raise BookingNotFoundException(booking_id)
+
+        for booking in bookings:
+            BookingService.check_booking_authorization(booking, current_user)
+            if booking.status == "cancelled":
+                raise InvalidBookingStateException(
+                    f"Booking {booking.booking_id} is already cancelled"
+                )
+
+        cancelled_at = _utcnow()
+        db.execute(
+            update(Booking)
+            .where(Booking.booking_id.in_(booking_ids))
+            .values(
+                status="cancelled",
+                cancelled_at=cancelled_at,
+                cancelled_by=current_user["user_id"],
+                updated_at=cancelled_at
+            )
+            .execution_options(synchronize_session=False)
+        )
+        BookingService._append_history(db, [
+            {
+                "booking_id": booking.booking_id,
+                "user_id": booking.user_id,
+                "room_id": booking.room_id,
+                "action": "cancelled",
+                "previous_start_time": None,
+                "previous_end_time": None,
+                "new_start_time": None,
+                "new_end_time": None,
+                "changed_by": current_user["user_id"],
+                "timestamp": cancelled_at
+            }
+            for booking in bookings
+        ], commit=False)
+        db.commit()
+
+        for room_id, booking_date in {
+            (b.room_id, b.booking_date) for b in bookings
+        }:
+            BookingService._invalidate_availability(room_id, booking_date)
+
+        return cancelled_at
     
     @staticmethod
     def check_availability(
@@ -538,16 +960,72 @@ class BookingService:
         Returns:
             True if available, False if conflicts exist
         """
-        return not BookingService.check_booking_conflict(
-            db, room_id, booking_date, start_time, end_time
-        )
+        key = (room_id, booking_date, start_time, end_time)
+        # Per-key lock: concurrent identical checks wait here and then
+        # hit the cache the first caller populated
+        with _availability_locks[key]:
+            cached = _availability_cache.get(key)
+            if cached is not None and monotonic() - cached[0] < _AVAILABILITY_TTL:
+                return cached[1]
+
+            available = not BookingService.check_booking_conflict(
+                db, room_id, booking_date, start_time, end_time
+            )
+            _availability_cache[key] = (monotonic(), available)
+
+        # Opportunistic sweep so distinct one-off keys can't grow the
+        # cache (and its lock table) without bound
+        if len(_availability_cache) > 10_000:
+            now = monotonic()
+            for stale in [
+                k for k, v in _availability_cache.items()
+                if now - v[0] >= _AVAILABILITY_TTL
+            ]:
+                _availability_cache.pop(stale, None)
+                _availability_locks.pop(stale, None)
+
+        return available
+
+    @staticmethod
+    def _invalidate_availability(room_id: int, booking_date: date_type):
+        """
+        Drop cached availability for a room/date after a mutation.
+
+        Called on successful create/update/cancel so a just-taken (or
+        just-freed) slot is never reported stale for the full TTL.
+
+        Args:
+            room_id: Room whose availability changed
+            booking_date: Date whose availability changed
+        """
+        for key in [
+            k for k in _availability_cache
+            if k[0] == room_id and k[1] == booking_date
+        ]:
+            _availability_cache.pop(key, None)
+
+        # The route-level Redis cache keys availability responses as
+        # avail:room:date:start:end; drop every slot for this room/date
+        if REDIS_AVAILABLE:
+            try:
+                for key in redis_client.scan_iter(
+                    f"avail:{room_id}:{booking_date}:*"
+                ):
+                    redis_client.delete(key)
+            except RedisError:
+                # Stale for at most the cache TTL; not worth failing
+                # the mutation over
+                logger.warning(
+                    "Availability cache invalidation failed for room %s on %s",
+                    room_id, booking_date, exc_info=True
+                )
     
     @staticmethod
     def get_room_schedule(
         db: Session,
         room_id: int,
         date: date_type
-    ) -> List[Booking]:
+    ) -> List[Row]:
         """
         Get all bookings for a room on specific date.
         
@@ -559,27 +1037,156 @@ class BookingService:
             date: Date to get schedule for
         
         Returns:
-            List of Booking models for that room and date
+            List of booking rows for that room and date
         """
         # Step 1: Verify room exists
         room_exists = BookingService.verify_room_exists(room_id, db)
         if not room_exists:
             raise RoomNotFoundException(room_id)
-        
-        bookings = db.query(Booking).filter(
+
+        stmt = select(*_BOOKING_COLUMNS).where(
             Booking.room_id == room_id,
             Booking.booking_date == date,
             # Only show active bookings (not cancelled)
-            Booking.status.in_(['confirmed', 'pending', 'completed'])
-        ).order_by(Booking.start_time).all()
-        
-        return bookings
-    
+            Booking.status.in_(_SCHEDULE_STATUSES)
+        ).order_by(Booking.start_time)
+
+        return db.execute(stmt).all()
+
+    @staticmethod
+    def compute_available_slots(
+        bookings: List[Row],
+        day_start: time_type = time_type(8, 0),
+        day_end: time_type = time_type(20, 0),
+        slot_minutes: int = 15
+    ) -> List[dict]:
+        """
+        Derive free 15-minute slots from an already-fetched schedule.
+
+        Pure in-memory bucketing over the rows get_room_schedule
+        returned - no extra query - so a schedule request with
+        include_availability costs the same single round trip. Clients
+        rendering a day picker stop issuing one availability check per
+        slot (the N+1 request waterfall).
+
+        Args:
+            bookings: Booking rows for the room/date (need start/end times)
+            day_start: Start of the bookable day
+            day_end: End of the bookable day
+            slot_minutes: Bucket width in minutes
+
+        Returns:
+            List of {"start_time", "end_time"} dicts for each free slot
+        """
+        # Completed bookings are in the past of the day view but still
+        # occupy their slot visually; treat any returned row as busy
+        busy = [(b.start_time, b.end_time) for b in bookings]
+
+        slots = []
+        anchor = date_type(2000, 1, 1)  # Arbitrary date for time arithmetic
+        cursor = datetime.combine(anchor, day_start)
+        day_end_dt = datetime.combine(anchor, day_end)
+        step = timedelta(minutes=slot_minutes)
+
+        while cursor + step <= day_end_dt:
+            slot_start = cursor.time()
+            slot_end = (cursor + step).time()
+            if not any(
+                times_overlap(slot_start, slot_end, b_start, b_end)
+                for b_start, b_end in busy
+            ):
+                slots.append({"start_time": slot_start, "end_time": slot_end})
+            cursor += step
+
+        return slots
+
+    @staticmethod
+    def get_schedule_etag(
+        db: Session,
+        room_id: int,
+        date: date_type
+    ) -> str:
+        """
+        Cheap change detector for a room's daily schedule.
+
+        Hashes (row count, latest created_at, latest updated_at) for the
+        room/date - a few-row aggregate against the composite index - so
+        routes can answer If-None-Match with a 304 without fetching or
+        serializing the schedule itself.
+
+        Args:
+            db: Database session
+            room_id: Room ID
+            date: Schedule date
+
+        Returns:
+            Short hex ETag string
+        """
+        row = db.execute(
+            select(
+                func.count(),
+                func.max(Booking.created_at),
+                func.max(Booking.updated_at)
+            ).where(
+                Booking.room_id == room_id,
+                Booking.booking_date == date,
+                Booking.status.in_(_SCHEDULE_STATUSES)
+            )
+        ).one()
+        raw = f"{room_id}:{date}:{row[0]}:{row[1]}:{row[2]}"
+        return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+    @staticmethod
+    def booking_etag(booking: Booking) -> str:
+        """
+        Change detector for a single booking row.
+
+        updated_at moves on every mutation (and cancelled_at/status on
+        cancellation), so hashing them identifies the row version; polled
+        detail pages answer If-None-Match with a 304 and skip
+        serialization entirely.
+
+        Args:
+            booking: Booking row to fingerprint
+
+        Returns:
+            Short hex ETag string
+        """
+        raw = (
+            f"{booking.booking_id}:{booking.created_at}:"
+            f"{booking.updated_at}:{booking.status}"
+        )
+        return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+    @staticmethod
+    def get_history_etag(db: Session, booking_id: int) -> str:
+        """
+        Cheap change detector for a booking's history trail.
+
+        Same idea as get_schedule_etag: history rows are append-only, so
+        (count, latest timestamp) identifies the trail exactly.
+
+        Args:
+            db: Database session
+            booking_id: Booking ID
+
+        Returns:
+            Short hex ETag string
+        """
+        row = db.execute(
+            select(
+                func.count(),
+                func.max(BookingHistory.timestamp)
+            ).where(BookingHistory.booking_id == booking_id)
+        ).one()
+        raw = f"{booking_id}:{row[0]}:{row[1]}"
+        return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
     @staticmethod
     def get_booking_history(
         db: Session,
         booking_id: int
-    ) -> List[BookingHistory]:
+    ) -> List[Row]:
         """
         Get complete history of changes for a booking.
         
@@ -588,13 +1195,11 @@ class BookingService:
             booking_id: Booking ID
         
         Returns:
-            List of BookingHistory records (newest first)
+            List of history rows (newest first)
         """
-        history = db.query(BookingHistory).filter(
-            BookingHistory.booking_id == booking_id
-        ).order_by(BookingHistory.timestamp.desc()).all()
-        
-        return history
+        return db.execute(
+            _SELECT_HISTORY_BY_BOOKING, {"id": booking_id}
+        ).all()
     
     @staticmethod
     def check_booking_authorization(
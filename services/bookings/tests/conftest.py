@@ -6,8 +6,9 @@ Author: Testing Suite
 """
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 import sys
 import os
 from datetime import date, time, timedelta
@@ -19,33 +20,64 @@ from main import app
 from database import Base, get_db
 from models import Booking, BookingHistory, Room
 import auth
+import services
 
-# Use file-based SQLite for testing (more reliable than in-memory for multiple sessions)
-import tempfile
-TEST_DATABASE_URL = f"sqlite:///{tempfile.gettempdir()}/test_bookings.db"
+# In-memory SQLite shared across sessions: StaticPool hands every
+# checkout the same connection, so the one in-memory database is visible
+# to all sessions without touching disk (no file IO, no fsync per commit)
+engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+
+# pysqlite issues implicit COMMITs that break SAVEPOINTs (the documented
+# "serializable isolation / savepoints" quirk): disable its transaction
+# management and emit BEGIN ourselves so the rollback-per-test pattern
+# below actually holds
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_begin(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Schema DDL runs once for the whole test session instead of
+# drop+create per test; isolation comes from the SAVEPOINT pattern in
+# the test_db fixture below
+Base.metadata.create_all(bind=engine)
+
+@pytest.fixture(autouse=True)
+def clear_room_cache():
+    """Reset the in-process TTL caches so tests stay isolated"""
+    services._room_cache.clear()
+    services._availability_cache.clear()
+    yield
+    services._room_cache.clear()
+    services._availability_cache.clear()
 
 @pytest.fixture(scope="function")
 def test_db():
-    """Create a fresh database for each test"""
-    engine = create_engine(
-        TEST_DATABASE_URL,
-        connect_args={"check_same_thread": False}
+    """Provide an isolated session wrapped in a rolled-back transaction"""
+    # SAVEPOINT pattern: the session joins an outer connection-level
+    # transaction and turns its own commit()s into savepoint releases,
+    # so service-layer commits behave normally but the teardown rollback
+    # discards everything - no per-test DDL or table truncation needed
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = TestingSessionLocal(
+        bind=connection,
+        join_transaction_mode="create_savepoint"
     )
-    
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    
-    # Drop all tables and recreate them for a fresh database
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
-    
-    db = TestingSessionLocal()
     try:
         yield db
     finally:
         db.close()
-        # Clean up
-        Base.metadata.drop_all(bind=engine)
-        engine.dispose()
+        transaction.rollback()
+        connection.close()
 
 @pytest.fixture(scope="function")
 def client(test_db):
@@ -193,10 +225,14 @@ def populate_bookings(test_db, populate_sample_room):
         ),
     ]
     
-    for booking in bookings:
-        test_db.add(booking)
+    # add_all + one commit: the 2.0 flush batches these into a single
+    # multi-row INSERT (insertmanyvalues) while keeping the instances
+    # session-attached, which tests that mutate and re-commit rely on.
+    # bulk_save_objects would also collapse the statements but returns
+    # detached objects, silently changing what those tests exercise.
+    test_db.add_all(bookings)
     test_db.commit()
-    
+
     return bookings
 
 # ============================================================================
@@ -8,6 +8,7 @@ Author: Testing Suite
 import pytest
 from datetime import date, time, timedelta
 from fastapi import status
+from sqlalchemy import event
 from unittest.mock import patch, MagicMock
 import json
 
@@ -191,6 +192,96 @@ class TestCreateBooking:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
+class TestBulkCreateBooking:
+    """Test bulk booking creation endpoint (POST /api/bookings/bulk)"""
+
+    @pytest.mark.integration
+    def test_bulk_create_success(
+        self, client, test_db, populate_sample_room,
+        mock_get_current_user_regular
+    ):
+        """Test creating a recurring series in one request"""
+        tomorrow = date.today() + timedelta(days=1)
+        batch = [
+            {
+                "room_id": 1,
+                "booking_date": (tomorrow + timedelta(weeks=week)).isoformat(),
+                "start_time": "14:00:00",
+                "end_time": "15:00:00",
+                "purpose": "Weekly sync"
+            }
+            for week in range(3)
+        ]
+
+        response = client.post("/api/bookings/bulk", json=batch)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert len(data) == 3
+        assert all(b["status"] == "confirmed" for b in data)
+        assert all("booking_id" in b for b in data)
+
+    @pytest.mark.integration
+    def test_bulk_create_conflict_rejects_batch(
+        self, client, test_db, populate_bookings,
+        mock_get_current_user_regular
+    ):
+        """Test that one conflicting row rejects the whole batch"""
+        tomorrow = date.today() + timedelta(days=1)
+        batch = [
+            {
+                "room_id": 1,
+                "booking_date": tomorrow.isoformat(),
+                "start_time": "11:00:00",  # Free slot
+                "end_time": "12:00:00",
+                "purpose": "Free slot"
+            },
+            {
+                "room_id": 1,
+                "booking_date": tomorrow.isoformat(),
+                "start_time": "14:30:00",  # Overlaps 14:00-15:30 booking
+                "end_time": "15:00:00",
+                "purpose": "Conflicting slot"
+            }
+        ]
+
+        response = client.post("/api/bookings/bulk", json=batch)
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        # All-or-nothing: the free slot must not have been written
+        listing = client.get("/api/bookings/")
+        purposes = [b["purpose"] for b in listing.json()]
+        assert "Free slot" not in purposes
+
+    @pytest.mark.integration
+    def test_bulk_create_intra_batch_overlap(
+        self, client, test_db, populate_sample_room,
+        mock_get_current_user_regular
+    ):
+        """Test that overlapping rows within the batch are rejected"""
+        tomorrow = date.today() + timedelta(days=1)
+        batch = [
+            {
+                "room_id": 1,
+                "booking_date": tomorrow.isoformat(),
+                "start_time": "09:00:00",
+                "end_time": "10:00:00",
+                "purpose": "First"
+            },
+            {
+                "room_id": 1,
+                "booking_date": tomorrow.isoformat(),
+                "start_time": "09:30:00",
+                "end_time": "10:30:00",
+                "purpose": "Overlaps first"
+            }
+        ]
+
+        response = client.post("/api/bookings/bulk", json=batch)
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+
 class TestGetBookings:
     """Test GET /api/bookings/ endpoint"""
     
@@ -231,11 +322,47 @@ class TestGetBookings:
         bookings = response.json()
         assert all(b["status"] == "confirmed" for b in bookings)
     
+    @pytest.mark.integration
+    def test_get_bookings_query_count(
+        self, client, test_db, populate_bookings,
+        mock_get_current_user_regular
+    ):
+        """Test list endpoint issues a constant number of queries (no N+1)"""
+        engine = test_db.get_bind()
+        selects = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_selects(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                selects.append(statement)
+
+        try:
+            response = client.get("/api/bookings/")
+        finally:
+            event.remove(engine, "before_cursor_execute", count_selects)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == 2
+        # One SELECT for the list itself; a count that scales with the
+        # number of rows means per-row lazy loads have crept in
+        assert len(selects) <= 2
+
+    @pytest.mark.integration
+    def test_get_bookings_malformed_cursor(
+        self, client, test_db, populate_bookings,
+        mock_get_current_user_regular
+    ):
+        """Test a garbage pagination cursor returns 400, not 500"""
+        response = client.get("/api/bookings/?cursor=not-a-cursor")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Invalid pagination cursor"
+
     @pytest.mark.integration
     def test_get_bookings_no_auth(self, client):
         """Test GET bookings without auth fails"""
         response = client.get("/api/bookings/")
-        
+
         assert response.status_code in [
             status.HTTP_401_UNAUTHORIZED,
             status.HTTP_403_FORBIDDEN
@@ -493,6 +620,45 @@ class TestCancelBooking:
         assert booking.status == "cancelled"
 
 
+class TestCancelBookingsBulk:
+    """Test bulk cancellation endpoint (POST /api/bookings/cancel-bulk)"""
+
+    @pytest.mark.integration
+    def test_cancel_bulk_success(
+        self, client, test_db, populate_bookings,
+        mock_get_current_user_regular
+    ):
+        """Test cancelling several bookings in one request"""
+        ids = [b.booking_id for b in populate_bookings[:2]]
+
+        response = client.post("/api/bookings/cancel-bulk", json=ids)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["booking_ids"] == ids
+        for booking_id in ids:
+            detail = client.get(f"/api/bookings/{booking_id}")
+            assert detail.json()["status"] == "cancelled"
+
+    @pytest.mark.integration
+    def test_cancel_bulk_not_owner_rejects_batch(
+        self, client, test_db, populate_bookings,
+        mock_get_current_user_regular
+    ):
+        """Test that another user's booking rejects the whole batch"""
+        own_id = populate_bookings[0].booking_id
+        other_id = populate_bookings[2].booking_id  # Belongs to user 2
+
+        response = client.post(
+            "/api/bookings/cancel-bulk", json=[own_id, other_id]
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        # All-or-nothing: the caller's own booking stays confirmed
+        detail = client.get(f"/api/bookings/{own_id}")
+        assert detail.json()["status"] == "confirmed"
+
+
 class TestCheckAvailability:
     """Test GET /api/bookings/availability/check endpoint"""
     
@@ -549,7 +715,7 @@ class TestCheckAvailability:
     ):
         """Test availability check with invalid time format"""
         tomorrow = date.today() + timedelta(days=1)
-        
+
         response = client.get(
             "/api/bookings/availability/check",
             params={
@@ -559,8 +725,9 @@ class TestCheckAvailability:
                 "end_time": "10:00:00"
             }
         )
-        
-        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        # Request validation rejects the malformed time before the handler
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
 class TestGetRoomSchedule:
@@ -601,6 +768,31 @@ class TestGetRoomSchedule:
         bookings = response.json()
         assert len(bookings) == 0
 
+    @pytest.mark.integration
+    def test_get_room_schedule_with_availability(
+        self, client, populate_bookings,
+        mock_get_current_user_regular
+    ):
+        """Test schedule with precomputed free slots in one request"""
+        tomorrow = date.today() + timedelta(days=1)
+
+        response = client.get(
+            f"/api/bookings/room/1/schedule",
+            params={"date": str(tomorrow), "include_availability": "true"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data["bookings"]) == 2
+
+        # 48 15-min slots between 08:00 and 20:00, minus 4 for the
+        # 09:00-10:00 booking and 6 for the 14:00-15:30 booking
+        slot_starts = {s["start_time"] for s in data["available_slots"]}
+        assert len(slot_starts) == 38
+        assert "08:00:00" in slot_starts
+        assert "09:00:00" not in slot_starts
+        assert "14:45:00" not in slot_starts
+
 
 class TestGetBookingHistory:
     """Test GET /api/bookings/{booking_id}/history endpoint"""
@@ -690,7 +882,45 @@ class TestAccessControl:
     ):
         """Test facility manager sees all bookings"""
         response = client.get("/api/bookings/")
-        
+
         assert response.status_code == status.HTTP_200_OK
         bookings = response.json()
         assert len(bookings) >= 3
+
+
+class TestUserActivityAnalytics:
+    """Test GET /api/analytics/users/activity endpoint"""
+
+    @pytest.mark.integration
+    def test_user_activity_as_admin(
+        self, client, test_db, populate_bookings,
+        mock_get_current_user_admin
+    ):
+        """Test admin gets user activity statistics"""
+        from models import User
+
+        test_db.add_all([
+            User(user_id=1, username="alice", email="alice@example.com",
+                 full_name="Alice One", role="regular_user"),
+            User(user_id=2, username="bob", email="bob@example.com",
+                 full_name="Bob Two", role="admin"),
+        ])
+        test_db.commit()
+
+        response = client.get("/api/analytics/users/activity")
+
+        assert response.status_code == status.HTTP_200_OK
+        stats = response.json()["user_statistics"]
+        assert stats["total_users"] == 2
+        # Both seeded users have bookings via populate_bookings
+        assert stats["active_users"] == 2
+        assert stats["role_distribution"] == {"regular_user": 1, "admin": 1}
+
+    @pytest.mark.integration
+    def test_user_activity_requires_admin(
+        self, client, test_db, mock_get_current_user_regular
+    ):
+        """Test non-admin users are rejected"""
+        response = client.get("/api/analytics/users/activity")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
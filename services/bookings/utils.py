@@ -6,10 +6,15 @@ Author: Dana Kossaybati
 """
 from datetime import datetime, date as date_type, time as time_type
 from typing import Tuple
-from redis import Redis
+from redis import Redis, RedisError
+import base64
+import inspect
 import json
+import logging
 from functools import wraps
 
+logger = logging.getLogger(__name__)
+
 def sanitize_input(text: str) -> str:
     """
     Sanitize user input to prevent SQL injection and XSS attacks.
@@ -113,53 +118,151 @@ def times_overlap(
     # Overlap occurs if start1 < end2 AND start2 < end1
     return start1 < end2 and start2 < end1
 
-# Initialize Redis
+def any_overlap(intervals, start: time_type, end: time_type) -> bool:
+    """
+    Check whether a candidate range overlaps any interval in a batch.
+
+    Early-exit loop over (start, end) tuples: the common case (no
+    conflict found quickly, or a conflict in the first few rows) does
+    far less work than checking every pair, and there is no per-call
+    function dispatch like mapping times_overlap would cost.
+
+    Args:
+        intervals: Iterable of (start_time, end_time) tuples
+        start: Candidate range start
+        end: Candidate range end
+
+    Returns:
+        True if the candidate overlaps at least one interval
+    """
+    for booked_start, booked_end in intervals:
+        if booked_start < end and booked_end > start:
+            return True
+    return False
+
+def encode_booking_cursor(booking_date: date_type, booking_id: int) -> str:
+    """
+    Encode a keyset-pagination cursor for booking lists.
+
+    The cursor is the (booking_date, booking_id) of the last row the
+    client saw, packed as base64 so it is opaque and URL-safe.
+
+    Args:
+        booking_date: Date of the last booking on the current page
+        booking_id: ID of the last booking on the current page
+
+    Returns:
+        Opaque cursor string for the next page request
+    """
+    raw = f"{booking_date.isoformat()}:{booking_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_booking_cursor(cursor: str) -> Tuple[date_type, int]:
+    """
+    Decode a keyset-pagination cursor back into (booking_date, booking_id).
+
+    Args:
+        cursor: Cursor string produced by encode_booking_cursor
+
+    Returns:
+        Tuple of (booking_date, booking_id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    date_str, _, id_str = raw.partition(":")
+    return date_type.fromisoformat(date_str), int(id_str)
+
+# Initialize Redis. Only connection-level failures mean "no cache";
+# anything else (a typo'd kwarg, an interrupt) should surface, not be
+# swallowed into degraded mode
 try:
     redis_client = Redis(host='localhost', port=6379, decode_responses=True, socket_connect_timeout=2)
     redis_client.ping()
     REDIS_AVAILABLE = True
-except:
+except RedisError:
+    redis_client = None
     REDIS_AVAILABLE = False
-    print("Redis not available - running without cache")
+    logger.warning("Redis not available - running without cache")
 
 
-def cache_response(expire_seconds=300):
+def cache_response(expire_seconds=300, key_func=None):
     """
     Cache API responses in Redis to improve performance.
 
-    Wraps an async endpoint function, stores its return value in Redis,
-    and automatically returns cached results for identical calls until
-    the expiration time is reached.
+    Wraps an endpoint function (sync or async), stores its return value
+    in Redis, and automatically returns cached results for identical
+    calls until the expiration time is reached. Plain `def` endpoints
+    get a sync wrapper so FastAPI still dispatches them to its
+    threadpool instead of the event loop. A cache hit returns the
+    stored dict, which FastAPI validates against the response_model
+    exactly like a fresh return value.
 
     Args:
         expire_seconds: How long the cached value should live in Redis.
+        key_func: Optional callable taking the handler's kwargs and
+            returning the cache key. When omitted, the key is derived
+            from the function name, the caller's identity (user_id and
+            role - most cached endpoints scope their data per user, so
+            per-user responses must stay per-user) and the remaining
+            kwargs, excluding the injected db session. Endpoints whose
+            result genuinely does not depend on the caller (e.g. the
+            availability check) pass a key_func to share one entry.
 
     Returns:
         A wrapped function that returns either the cached response
         or the fresh response from the original function.
     """
+    def _lookup(func, args, kwargs):
+        if key_func is not None:
+            cache_key = key_func(kwargs)
+        else:
+            # The injected session is per-request noise, but identity is
+            # load-bearing: cached endpoints scope rows (and admin-only
+            # branches) by user_id/role, so sharing one entry across
+            # callers would leak one user's payload to everyone else
+            key_kwargs = {
+                k: v for k, v in kwargs.items()
+                if k not in ('db', 'current_user')
+            }
+            user = kwargs.get('current_user') or {}
+            identity = f"{user.get('user_id')}:{user.get('role')}"
+            cache_key = f"{func.__name__}:{identity}:{str(args)}:{str(key_kwargs)}"
+        cached = redis_client.get(cache_key)
+        if cached:
+            # Lazy %-formatting: no string built unless DEBUG is emitted
+            logger.debug("Cache hit: %s", cache_key)
+        return cache_key, cached
+
+    def _store(cache_key, expire_seconds, result):
+        # Pydantic models aren't json-serializable directly
+        payload = result.model_dump(mode="json") if hasattr(result, "model_dump") else result
+        redis_client.setex(cache_key, expire_seconds, json.dumps(payload))
+        logger.debug("Cache miss: %s", cache_key)
+
     def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            if not REDIS_AVAILABLE:
-                return await func(*args, **kwargs)
-            
-            # Create cache key from function name and args
-            cache_key = f"{func.__name__}:{str(args)}:{str(kwargs)}"
-            
-            # Check cache
-            cached = redis_client.get(cache_key)
-            if cached:
-                print(f"CACHE HIT: {cache_key}")
-                return json.loads(cached)
-            
-            # Execute function
-            result = await func(*args, **kwargs)
-            
-            # Cache result
-            redis_client.setex(cache_key, expire_seconds, json.dumps(result))
-            print(f"CACHE MISS: {cache_key}")
-            
-            return result
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                if not REDIS_AVAILABLE:
+                    return await func(*args, **kwargs)
+                cache_key, cached = _lookup(func, args, kwargs)
+                if cached:
+                    return json.loads(cached)
+                result = await func(*args, **kwargs)
+                _store(cache_key, expire_seconds, result)
+                return result
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not REDIS_AVAILABLE:
+                    return func(*args, **kwargs)
+                cache_key, cached = _lookup(func, args, kwargs)
+                if cached:
+                    return json.loads(cached)
+                result = func(*args, **kwargs)
+                _store(cache_key, expire_seconds, result)
+                return result
         return wrapper
     return decorator